@@ -0,0 +1,164 @@
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import datetime as dt
+import pandas as pd
+import costtrack
+import data_access
+from data_access import issue_times, use_store
+from fake_tracker import FakeTracker, synthetic
+from prefetch import Fetcher
+
+
+def define_parser():
+    """ Return CLI arguments parser
+    """
+    parser = argparse.ArgumentParser(description='Costtrack benchmark on offline fake Tracker.')
+    parser.add_argument('-p', '--persons', metavar='N', type=int, nargs='+', default=[10, 100],
+                        help='persons counts to benchmark; default - 10 100')
+    parser.add_argument('-i', '--issues', metavar='N', type=int, nargs='+', default=[1000, 10000],
+                        help='issues counts to benchmark; default - 1000 10000')
+    parser.add_argument('--projects', metavar='N', type=int, default=10,
+                        help='projects count; default - 10')
+    parser.add_argument('--latency', metavar='SECONDS', type=float, default=0.0,
+                        help='simulated Tracker round-trip; default - 0')
+    parser.add_argument('-w', '--workers', metavar='N', type=int, default=8,
+                        help='concurrent Tracker requests count; default - 8')
+    parser.add_argument('--fixture', metavar='JSON_FILE',
+                        help='benchmark recorded Tracker data instead of synthetic (persons/issues ignored)')
+    parser.add_argument('--record', metavar='JSON_FILE',
+                        help='store synthetic Tracker data of the last run as JSON fixture')
+    parser.add_argument('--no-main', default=False, action='store_true',
+                        help='skip full costtrack.main run')
+    parser.add_argument('--startup', default=False, action='store_true',
+                        help='measure entry points cold start (time to the first output line) instead')
+    parser.add_argument('--runs', metavar='N', type=int, default=5,
+                        help='startup runs count to average; default - 5')
+    return parser
+
+
+def _reset():
+    """ Drop all in-memory and persistent caches """
+    use_store(None)
+    for cache in data_access._caches:
+        cache.clear()
+
+
+def _stage(results, size, name, count, tracker, func):
+    """ Run benchmark stage, collect time, throughput and API calls """
+    tracker.calls.clear()
+    started = time.perf_counter()
+    value = func()
+    elapsed = time.perf_counter() - started
+    results.append({'size': size, 'stage': name, 'items': count, 'seconds': round(elapsed, 3),
+                    'items/s': round(count / elapsed) if elapsed else None,
+                    'api calls': sum(tracker.calls.values())})
+    return value
+
+
+def _write_scandata(filename, project_rows, person_rows):
+    with pd.ExcelWriter(filename) as writer:
+        pd.DataFrame([['Должность', 'Начальник'], ['Инициалы, фамилия', 'И.И. Иванов']]) \
+            .to_excel(writer, sheet_name='Boss', header=False, index=False)
+        pd.DataFrame(project_rows, columns=['name', 'request']) \
+            .to_excel(writer, sheet_name='Projects', index=False)
+        pd.DataFrame(person_rows, columns=['name', 'login', 'move_cost']) \
+            .to_excel(writer, sheet_name='Persons', index=False)
+
+
+def run(size, tracker, project_rows, person_rows, year, workers, with_main=True):
+    """ Benchmark costtrack stages on fake tracker, return list of results rows """
+    results = list()
+    projects = pd.DataFrame(project_rows, columns=['name', 'request'])
+    persons = pd.DataFrame(person_rows, columns=['name', 'login', 'move_cost'])
+    periods = costtrack.report_months(dt.datetime(year, 1, 1), dt.datetime(year, 12, 1))
+    fetcher = Fetcher(workers=workers)
+
+    _reset()
+    issues, registry = _stage(results, size, 'get_issues', len(projects), tracker,
+                              lambda: costtrack.resolve_projects(tracker, projects, fetcher))
+    _stage(results, size, 'issue_times', len(issues), tracker,
+           lambda: fetcher.map(lambda i: issue_times(i, periods[0][0].date()), issues.values()))
+    directory = data_access.UserDirectory.load(tracker)
+    _stage(results, size, 'spend (aggregate, 12 months)', len(issues), tracker,
+           lambda: costtrack.aggregate(issues, registry, persons, periods, directory))
+    fetcher.close()
+
+    if with_main:
+        _reset()
+        folder = os.getcwd()
+        connect = costtrack.connect
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                os.chdir(tmp)
+                _write_scandata('ScanData.xlsx', project_rows, person_rows)
+                costtrack.connect = lambda filename='connect.ini': tracker
+                sys.argv = ['costtrack.py', '-d', f'{year % 100}-6', '-w', str(workers)]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _stage(results, size, 'main (one month)', len(issues), tracker, costtrack.main)
+            finally:
+                costtrack.connect = connect
+                os.chdir(folder)
+    return results
+
+
+def startup(commands, runs=5):
+    """ Measure commands cold start: seconds to the first output line (command is killed then), return results rows """
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+    results = list()
+    for command in commands:
+        times = list()
+        for _ in range(runs):
+            started = time.perf_counter()
+            with subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                  stderr=subprocess.STDOUT, env=env) as process:
+                process.stdout.readline()
+                times.append(time.perf_counter() - started)
+                process.kill()
+        results.append({'command': ' '.join(command[1:]), 'first line, s': round(sum(times) / runs, 3),
+                        'min, s': round(min(times), 3), 'max, s': round(max(times), 3)})
+    return results
+
+
+def main():
+    args = define_parser().parse_args()
+    if args.startup:
+        folder = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as tmp:
+            scandata = os.path.join(tmp, 'ScanData.xlsx')
+            _write_scandata(scandata, [], [])
+            results = startup([[sys.executable, os.path.join(folder, 'costtrack.py'), '--help'],
+                               [sys.executable, os.path.join(folder, 'costsheet.py'), '--help'],
+                               [sys.executable, os.path.join(folder, 'costtrack.py'), scandata, '-d', '25-1']],
+                              args.runs)
+        print(pd.DataFrame(results).to_string(index=False))
+        return
+    year = 2025
+    results = list()
+    if args.fixture:
+        tracker = FakeTracker.from_json(args.fixture, args.latency)
+        data = {'users': list(tracker._users.values()), 'issues': list(tracker._issues.values())}
+        queues = sorted({i['queue'] for i in data['issues']})
+        project_rows = [(f'Project {q}', f'Queue: {q}') for q in queues]
+        person_rows = [(u['display'], u['display'], '') for u in data['users']]
+        results += run('fixture', tracker, project_rows, person_rows, year, args.workers, not args.no_main)
+    else:
+        for persons in args.persons:
+            for issues in args.issues:
+                data, project_rows, person_rows = synthetic(persons, issues, args.projects, year)
+                tracker = FakeTracker(data, args.latency)
+                results += run(f'{persons}x{issues}', tracker, project_rows, person_rows,
+                               year, args.workers, not args.no_main)
+                if args.record:
+                    tracker.to_json(args.record)
+    pd.set_option('display.width', 1000)
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
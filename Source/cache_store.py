@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+import json
+import time
+from collections import Counter
+
+SCHEMA_VERSION = 6  # stored records format, store is rebuilt on mismatch
+TABLES = ['times', 'links', 'users', 'trees']
+
+
+class CacheStore:
+    """ Persistent on-disk cache of Tracker data, keyed by issue key and issue updatedAt.
+    Cached record is valid until the issue updatedAt moves.
+    Record may cover changes since some date only (period-aware loading), see 'since'. """
+
+    def __init__(self, filename='costtrack.cache', max_entries=50000, max_age_days=180, refresh=False):
+        """
+        @param filename: sqlite database filename
+        @param max_entries: max issues kept per table, least recently used evicted
+        @param max_age_days: records not used for this number of days evicted
+        @param refresh: ignore stored records (records are overwritten with fresh data)
+        """
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.refresh = refresh
+        self.pending = 0  # uncommitted writes count
+        self.hits = Counter()  # {table: hits}
+        self.misses = Counter()  # {table: misses}
+        self.evictions = 0
+        self.lock = threading.Lock()  # store is shared by prefetch threads
+        self.db = sqlite3.connect(filename, check_same_thread=False)
+        if self.db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            for table in TABLES:
+                self.db.execute(f'DROP TABLE IF EXISTS {table}')
+            self.db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        for table in TABLES:
+            self.db.execute(f'CREATE TABLE IF NOT EXISTS {table} ('
+                            'key TEXT PRIMARY KEY, updated TEXT, since TEXT, data TEXT, used REAL)')
+        self.db.commit()
+        self.evict()
+
+    def _get(self, table, key, updated, since=None):
+        if self.refresh:
+            return None
+        with self.lock:
+            row = self.db.execute(f'SELECT updated, since, data FROM {table} WHERE key = ?', (key,)).fetchone()
+            if row is None or updated is not None and row[0] != updated or \
+                    row[1] is not None and (since is None or row[1] > since):  # absent, outdated or don't cover
+                self.misses[table] += 1
+                return None
+            self.hits[table] += 1
+            self.db.execute(f'UPDATE {table} SET used = ? WHERE key = ?', (time.time(), key))
+        return json.loads(row[2])
+
+    def _put(self, table, key, updated, data, since=None):
+        data = json.dumps(data, ensure_ascii=False)
+        with self.lock:
+            self.db.execute(f'INSERT OR REPLACE INTO {table} (key, updated, since, data, used) '
+                            'VALUES (?, ?, ?, ?, ?)',
+                            (key, updated, since, data, time.time()))
+            self.pending += 1
+            if self.pending >= 100:  # keep crawl progress on interrupted runs
+                self.db.commit()
+                self.pending = 0
+
+    def get_times(self, key, updated, since=None):
+        """ Return stored issue change records (as lists of fields)
+        or None if absent, outdated or not covering since date """
+        return self._get('times', key, updated, None if since is None else since.isoformat())
+
+    def put_times(self, key, updated, times, since=None):
+        """ Store issue change records (tuples of fields), covering changes since date (all the changes if None) """
+        self._put('times', key, updated, times, None if since is None else since.isoformat())
+
+    def get_links(self, key, updated):
+        """ Return stored list of issue subtasks keys or None if absent or outdated """
+        return self._get('links', key, updated)
+
+    def put_links(self, key, updated, keys):
+        """ Store list of issue subtasks keys """
+        self._put('links', key, updated, keys)
+
+    def get_tree(self, root):
+        """ Return stored subtasks tree of root issue: (nodes {key: updatedAt}, walk timestamp) or None;
+        caller checks nodes are not updated """
+        data = self._get('trees', root, None)
+        return None if data is None else (data['nodes'], data['walked'])
+
+    def put_tree(self, root, nodes, walked):
+        """ Store subtasks tree nodes {key: updatedAt} of root issue (root included),
+        walked - timestamp of the walk with links loaded from Tracker """
+        self._put('trees', root, nodes.get(root, ''), {'nodes': nodes, 'walked': walked})
+
+    def get_users(self, day):
+        """ Return stored list of users (id, login, display) loaded at the day or None """
+        data = self._get('users', 'users', day)
+        return None if data is None else [tuple(user) for user in data]
+
+    def put_users(self, day, users):
+        """ Store list of users (id, login, display) loaded at the day """
+        self._put('users', 'users', day, users)
+
+    def evict(self):
+        """ Drop aged records, then least recently used above max_entries """
+        with self.lock:
+            for table in TABLES:
+                self.evictions += self.db.execute(f'DELETE FROM {table} WHERE used < ?',
+                                                  (time.time() - self.max_age,)).rowcount
+                self.evictions += self.db.execute(f'DELETE FROM {table} WHERE key NOT IN '
+                                                  f'(SELECT key FROM {table} ORDER BY used DESC LIMIT ?)',
+                                                  (self.max_entries,)).rowcount
+            self.db.commit()
+
+    def stats(self):
+        return {'hits': sum(self.hits.values()), 'misses': sum(self.misses.values()), 'evictions': self.evictions,
+                'tables': {table: {'hits': self.hits[table], 'misses': self.misses[table]} for table in TABLES}}
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
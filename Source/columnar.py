@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+# columnar costs interchange: one compressed numpy archive per report month, "costs-yy-mm.npz":
+#   costs - persons x projects int64 matrix, persons and projects - its labels (may repeat, as in workbook),
+#   boss - boss sheet cells as strings,
+#   entry_person, entry_project (positions in persons and projects, the first of equal labels), entry_key,
+#   entry_kind, entry_value (int64, as the matrix) - per issue aggregates the matrix is summed from
+
+
+def _positions(labels, values, what):
+    """ Return positions of values in labels array, the first one of repeated labels """
+    index = pd.Index(labels)
+    unique = ~index.duplicated()
+    found = index[unique].get_indexer(values)
+    if (found < 0).any():
+        raise ValueError(f'costs entries of unknown {what}: {", ".join(sorted(set(values[found < 0])))}')
+    return np.flatnonzero(unique)[found]
+
+
+def store_costs(filename, boss, report, entries=None):
+    """
+    Store month costs to columnar file, all the arrays are written at once.
+    @param filename: npz filename
+    @param boss: boss dataframe
+    @param report: persons x projects costs dataframe, see costtrack.aggregate()
+    @param entries: optional per issue aggregates dataframe (name, project, key, kind, value)
+    """
+    persons = report.index.astype(str).to_numpy(dtype=str)
+    projects = report.columns.astype(str).to_numpy(dtype=str)
+    if entries is None:
+        entries = pd.DataFrame({'name': [], 'project': [], 'key': [], 'kind': [], 'value': []})
+    np.savez_compressed(filename,
+                        costs=report.to_numpy(dtype='int64'),
+                        persons=persons,
+                        projects=projects,
+                        boss=boss.fillna('').astype(str).to_numpy(dtype=str),
+                        entry_person=_positions(persons, entries['name'].astype(str).to_numpy(dtype=str), 'persons'),
+                        entry_project=_positions(projects, entries['project'].astype(str).to_numpy(dtype=str),
+                                                 'projects'),
+                        entry_key=entries['key'].astype(str).to_numpy(dtype=str),
+                        entry_kind=entries['kind'].astype(str).to_numpy(dtype=str),
+                        entry_value=entries['value'].to_numpy(dtype='int64'))
+
+
+def load_costs(filename, entries=False):
+    """
+    Load month costs from columnar file.
+    @param filename: npz filename
+    @param entries: load per issue aggregates too
+    @return: tuple of (costs dataframe indexed by person, boss dataframe[, entries dataframe])
+    """
+    with np.load(filename) as data:
+        persons, projects = data['persons'], data['projects']
+        costs = pd.DataFrame(data['costs'], index=persons.tolist(), columns=projects.tolist())
+        boss = pd.DataFrame(data['boss'].astype(object))
+        if not entries:
+            return costs, boss
+        details = pd.DataFrame({'name': persons[data['entry_person']],
+                                'project': projects[data['entry_project']],
+                                'key': data['entry_key'],
+                                'kind': data['entry_kind'],
+                                'value': data['entry_value']})
+    return costs, boss, details
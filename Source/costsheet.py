@@ -1,14 +1,20 @@
 import logging
-import pandas as pd
 import datetime as dt
 import argparse
+import multiprocessing
 import os
 from colorama import init as colorama_init
 from colorama import Fore
 from colorama import Style
 import re
 import math
-from docxtpl import DocxTemplate
+import bisect
+import itertools
+from profiling import profiler, json_filename
+from incremental import fingerprint, load_state, save_state
+
+# heavy modules (pandas, numpy, docxtpl) are imported by the functions using them:
+# help, arguments and input errors are answered without loading them, see README "Startup"
 
 
 def define_parser():
@@ -24,111 +30,205 @@ def define_parser():
                         type=lambda s: dt.datetime.strptime(s, '%y-%m'),
                         help='report period in "y-m" format (like "25-1" for january 2025); '
                              'default - previous month until 14th, current month since 15th')
+    parser.add_argument('--split', metavar='N', type=int, nargs='?', const=1,
+                        help='render every N projects (default 1) to separate document, in parallel processes')
+    parser.add_argument('-j', '--jobs', metavar='N', type=int,
+                        help='rendering processes count for --split; default - CPU count')
+    parser.add_argument('-i', '--incremental', default=False, action='store_true',
+                        help='recompute only persons and re-render only documents with changed inputs '
+                             'since the previous incremental run; without --split any change re-renders '
+                             'the whole document')
+    parser.add_argument('--profile', default=False, action='store_true',
+                        help='store stages time and caches statistics to JSON file')
+    parser.add_argument('--profile-file', metavar='JSON_FILE', type=json_filename, default='costsheet-profile.json',
+                        help='with --profile: profile filename; default - "costsheet-profile.json"')
+    parser.add_argument('--cprofile', default=False, action='store_true',
+                        help='with --profile: store cProfile statistics to .prof file of the same name')
     parser.add_argument('--debug', default=False, action='store_true',
                         help='logging in debug mode')
     return parser
 
 
 def import_hr_table(filename):
-    in_table = pd.read_excel(filename, header=None, index_col=None)
-    # print(in_table[2])
-    # input('Press Enter')
-    persons = list()
-    for index, row in in_table.iterrows():
-        # detect person record by cyrillic in column 2
-        if re.match('[А-ЯЁа-яё \\-]+', str(row[2])) and re.match('\\d+', str(row[1])):
-            words = str(row[2]).split() + \
-                    str(in_table.iloc[int(index) + 1, 1]).split() + \
-                    str(in_table.iloc[int(index) + 2, 1]).split()
-            name = ' '.join(words[:2])  # split & join to remove extra spaces
-            # over-check name structure
-            if not re.match('^[А-ЯЁ][а-яё]+(?:-[А-ЯЁ][а-яё]+)*(?:\\s[А-ЯЁ][а-яё]+(?:-[А-ЯЁ][а-яё]+)*){1,2}$',
-                            name):
-                raise ValueError(f'Name not properly formatted: "{name}"')
-            emp_num = str(row[1]).strip()
-            if not re.match('^\\d+$', emp_num):
-                raise ValueError(f'Employee "{name}" number not properly formatted: "{emp_num}"')
-            # spec = str(in_table.iloc[int(index) + 2, 1]).strip()  # speciality
-            spec = ''  # unable to get employee spec from actual data format
-            status = in_table.iloc[int(index) + 1, 9:].tolist()  # slice of status letters
-            times = row[9:].to_list()  # slice of day-times
-            times = [0 if math.isnan(t) else math.floor(t) for t in times]  # zero NaNs, drop all lees 1 hour
-            # check days count is the same
-            if len(times) != len(status):
-                raise ImportError(f'Timedata not match status for "{name}"')
-            # build dictionary data structure
-            person = {'name': name, 'num': emp_num, 'spec': spec, 'total': sum(times)}
-            person.update({f'h{i}': t for i, t in enumerate(times, 1)})
-            person.update({f'pres{i}': t for i, t in enumerate(status, 1)})
-            persons.append(person)
-    return persons
-
-
-def export_sheet(context, template, filename='DocExample.docx'):
-    print(f'{Fore.GREEN}Rendering...{Style.RESET_ALL}')
-    doc = DocxTemplate(template)
-    doc.render(context)
-    doc.save(filename)
-    print(f'{Fore.GREEN}Complete and stored to "{filename}".{Style.RESET_ALL}')
+    """
+    Parse employees T13 timesheet.
+    Person block starts with row of employee number (column 1) and cyrillic name (column 2),
+    name may continue in column 1 of two next rows; day hours are in the block row from column 9,
+    day status letters - in the next row.
+    @param filename: T13 xlsx filename
+    @return: dataframe indexed by person name: num, spec, total, h1..hN (whole hours), pres1..presN (statuses)
+    """
+    import numpy as np
+    import pandas as pd
+    from excel_io import read_sheets
+    in_table = read_sheets(filename, {0: dict(header=None, index_col=None)})[0]
+    # detect person records by cyrillic in column 2 and number in column 1
+    heads = in_table[2].astype(str).str.match('[А-ЯЁа-яё \\-]+', na=False) & \
+        in_table[1].astype(str).str.match('\\d+', na=False)
+    rows = np.flatnonzero(heads.to_numpy())
+    cells = np.vstack([in_table.to_numpy(dtype=object),
+                       np.full((2, in_table.shape[1]), np.nan, dtype=object)])  # pad for blocks tail rows
+    names = [' '.join((str(cells[r, 2]) + ' ' + str(cells[r + 1, 1]) + ' ' + str(cells[r + 2, 1])).split()[:2])
+             for r in rows]  # split & join to remove extra spaces
+    nums = [str(cells[r, 1]).strip() for r in rows]
+    # over-check names and numbers structure, report all the wrong rows
+    errors = [f'row {r + 1}: name not properly formatted: "{name}"' for r, name in zip(rows, names)
+              if not re.match('^[А-ЯЁ][а-яё]+(?:-[А-ЯЁ][а-яё]+)*(?:\\s[А-ЯЁ][а-яё]+(?:-[А-ЯЁ][а-яё]+)*){1,2}$',
+                              name)]
+    errors += [f'row {r + 1}: employee "{name}" number not properly formatted: "{num}"'
+               for r, name, num in zip(rows, names, nums) if not re.match('^\\d+$', num)]
+    if errors:
+        raise ValueError('\n'.join(['HR table format errors:'] + errors))
+    # slice day-times and status letters blocks, zero NaNs, drop all less 1 hour
+    times = np.floor(np.nan_to_num(cells[rows, 9:].astype(float))).astype('int64')
+    status = cells[rows + 1, 9:]
+    days = range(1, times.shape[1] + 1)
+    # spec = speciality in column 1 of the third block row
+    # unable to get employee spec from actual data format
+    table = pd.concat([pd.DataFrame({'num': nums, 'spec': '', 'total': times.sum(axis=1)}, index=names),
+                       pd.DataFrame(times, index=names, columns=[f'h{i}' for i in days]),
+                       pd.DataFrame(status, index=names, columns=[f'pres{i}' for i in days])], axis=1)
+    table.index.name = 'name'
+    return table
 
 
-def main():
-    # init
+class NameIndex:
+    """ Employees full names index: names lower-cased once and joined to one text, one per line.
+    Selector matches full names containing it (case-insensitive), as plain substring scan does -
+    in the middle of a word too, so it is searched in the text (str.find), not by words. """
 
-    args = define_parser().parse_args()  # get CLI arguments
-    colorama_init()
-    logging.basicConfig(filename='costsheet.log',
-                        filemode='a',
-                        format='%(asctime)s %(name)s %(levelname)s %(message)s',
-                        datefmt='%d/%m/%y %H:%M:%S',
-                        level=logging.INFO if args.debug else logging.WARNING)
-    logging.info('Costsheet started.')
+    def __init__(self, names):
+        """
+        @param names: list of employees full names
+        """
+        self.names = list(names)
+        self._lower = [name.lower() for name in self.names]
+        self._text = ''.join(name + '\n' for name in self._lower)
+        self._starts = list(itertools.accumulate((len(name) + 1 for name in self._lower), initial=0))
 
-    # Configure pandas to full output
+    def select(self, selector):
+        """ Return list of full names matching selector, in names order """
+        selector = selector.lower()
+        found = list()
+        pos = self._text.find(selector)
+        while 0 <= pos < len(self._text):
+            i = bisect.bisect_right(self._starts, pos) - 1
+            end = self._starts[i] + len(self._lower[i])
+            if pos + len(selector) <= end:  # inside the name, not across names
+                found.append(self.names[i])
+                pos = self._text.find(selector, end + 1)
+            else:
+                pos = self._text.find(selector, pos + 1)
+        return found
 
-    pd.set_option('display.max_rows', 700)
-    pd.set_option('display.max_columns', 500)
-    pd.set_option('display.width', 1000)
 
-    # define dates
-    # in not defined in argument - two first week set to previous month, otherwise - to current month
-    if ''.join(s for s in os.getlogin() if s.isalnum()).lower()[:3] != 'sea':
+def allocate(hours, status, costs, days_count):
+    """
+    Spread person projects costs over month days: projects one after another fill the day hours,
+    the next project continues the day where the previous one stopped.
+    Day hours are cumulated into a person time line, projects costs into boundaries on it,
+    project day time is the overlap of the project and the day intervals.
+    @param hours: person day hours, day 1 first (whole hours)
+    @param status: person day status letters, day 1 first
+    @param costs: list of (project name, cost) of projects person participates, in allocation order
+    @param days_count: days in report month
+    @return: dict {project name: dict h1..h31, pres1..pres31, hp1, dp1, hp2, dp2, sh, sd}
+    """
+    import numpy as np
+    hours = np.asarray(hours, dtype='int64')[:31]
+    status = np.asarray(status, dtype=object)[:31]
+    days = len(hours)
+    day_end = np.cumsum(hours)
+    day_start = day_end - hours
+    size = np.array([math.floor(cost) for _, cost in costs], dtype='int64')  # fractions of hour are dropped
+    prj_end = np.cumsum(size)
+    prj_start = prj_end - size
+    if len(costs) and prj_end[-1] > (day_end[-1] if days else 0):
+        raise ValueError(f'not enough working time for {prj_end[-1]} hours of projects')
+    # projects x days matrix of spent hours
+    spent = np.clip(np.minimum(prj_end[:, None], day_end[None, :]) -
+                    np.maximum(prj_start[:, None], day_start[None, :]), 0, None)
+    # defaults: empty day - 'Н' if person was at work, else day status; days out of month - 'X'
+    valid = min(days, days_count)
+    empty_pres = np.full(31, 'X', dtype=object)
+    empty_pres[:valid] = np.where(hours[:valid] > 0, 'Н', status[:valid])
+    empty_time = np.full(31, 'X', dtype=object)
+    empty_time[:valid] = ' '
+    time_keys = [f'h{i}' for i in range(1, 32)]
+    pres_keys = [f'pres{i}' for i in range(1, 32)]
+    projects = dict()
+    for (project, _), row in zip(costs, spent):
+        worked = np.flatnonzero(row)
+        time_row = empty_time.copy()
+        time_row[worked] = row[worked].tolist()
+        pres_row = empty_pres.copy()
+        pres_row[worked] = status[worked]
+        hp1, hp2 = int(row[:15].sum()), int(row[15:].sum())
+        dp1, dp2 = int(np.count_nonzero(row[:15])), int(np.count_nonzero(row[15:]))
+        projects[project] = dict(zip(time_keys, time_row.tolist())) | dict(zip(pres_keys, pres_row.tolist())) | \
+            {'hp1': hp1, 'dp1': dp1, 'hp2': hp2, 'dp2': dp2, 'sh': hp1 + hp2, 'sd': dp1 + dp2}
+    return projects
+
+
+def check_login():
+    """ Return alphanumeric part of OS login, raise if user is not allowed """
+    login = ''.join(s for s in os.getlogin() if s.isalnum())
+    if login.lower()[:3] != 'sea':
         raise ValueError('You are not logged.')
-    today = dt.datetime.now(dt.timezone.utc)
-    rep_period = today + dt.timedelta(days=-14) if args.date is None else args.date
-    days_count = ((rep_period.replace(day=28) + dt.timedelta(days=4)).replace(day=1) + dt.timedelta(days=-1)).day
-    print(f'Building costs report for {Fore.GREEN}{rep_period.strftime("%B %Y")}{Style.RESET_ALL}')
+    return login
 
-    # load projects/persons and boss
-    pp_filename = f'costs-{rep_period.strftime("%y-%m")}.xlsx'
-    if not os.path.isfile(pp_filename):
-        raise ValueError(f'{pp_filename} not found!')
-    pp_costs = pd.read_excel(pp_filename, sheet_name='costs', index_col=0)
-    boss = pd.read_excel(pp_filename, sheet_name='boss', header=None, index_col=None, usecols=[1])
-    print(boss.loc[0, 1], boss.loc[1, 1])
 
-    # load and parse employee table
-    if args.table_filename == 'T13_default_table_name_magic_value':
-        emp_filename = f'T13-{rep_period.strftime("%y-%m")}.xlsx'
-    else:
-        emp_filename = args.table_filename
-    emp_table = pd.DataFrame(import_hr_table(emp_filename))
-    # print(emp_table['name'])
-    emp_table.set_index('name', inplace=True)
+def load_costs(rep_period):
+    """
+    Load persons projects costs, stored by costtrack to "costs-yy-mm.npz" (columnar) or "costs-yy-mm.xlsx".
+    The most recently modified of them is used (npz of the same time preferred): costtrack stores npz after
+    the workbook, so manual workbook corrections made later take effect.
+    @param rep_period: report month date
+    @return: tuple of (costs dataframe indexed by person, boss dataframe)
+    """
+    name = f'costs-{rep_period.strftime("%y-%m")}'
+    found = [filename for filename in [name + '.npz', name + '.xlsx'] if os.path.isfile(filename)]
+    if not found:
+        raise ValueError(f'{name}.xlsx not found!')
+    pp_filename = max(found, key=os.path.getmtime)
+    if pp_filename.endswith('.npz'):
+        from columnar import load_costs as load_columnar
+        pp_costs, boss = load_columnar(pp_filename)
+        return pp_costs, boss[[1]]  # as the workbook boss sheet read
+    from excel_io import read_sheets
+    pp_sheets = read_sheets(pp_filename, {'costs': dict(index_col=0),
+                                          'boss': dict(header=None, index_col=None, usecols=[1])})
+    return pp_sheets['costs'], pp_sheets['boss']
+
+
+def build_context(pp_costs, boss, emp_table, rep_period, today, stored=None):
+    """
+    Match costs persons to employees, trim exceeded costs and spread projects costs over days.
+    @param pp_costs: persons projects costs, see load_costs()
+    @param boss: boss dataframe, see load_costs()
+    @param emp_table: employees table, see import_hr_table()
+    @param rep_period: report month date
+    @param today: report date
+    @param stored: dict {inputs fingerprint: person data} of the previous run, allocation is reused
+    for persons with unchanged HR row and costs; refreshed in place
+    @return: report context: {'projects': [project dict with persons list 'emps']}
+    """
+    days_count = ((rep_period.replace(day=28) + dt.timedelta(days=4)).replace(day=1) + dt.timedelta(days=-1)).day
 
     # find and update persons names in persons/projects
     # reindex, clear zero persons, sort by name
-    emp_names = emp_table.index.tolist()  # list of full names
-    full_names = list()
-    for name in pp_costs.index.tolist():
-        new_name = [n for n in emp_names if name.lower() in n.lower()]  # get all matching full names
-        if len(new_name) > 1:
-            print(f'{Fore.RED}WARNING: too wide selector for {name}: {"; ".join(new_name)}{Style.RESET_ALL}')
-            logging.warning(f'too wide selector as {name}: {";".join(new_name)}')
-        if len(new_name) == 0:
-            raise ValueError(f'no employee data for {name}')
-        full_names.append(new_name[0])
-    pp_costs['fullname'] = full_names
+    with profiler.stage('name matching'):
+        names_index = NameIndex(emp_table.index)
+        matches = {name: names_index.select(name) for name in pp_costs.index.tolist()}  # all matching full names
+    for name, found in matches.items():
+        if len(found) > 1:
+            print(f'{Fore.RED}WARNING: too wide selector for {name}: {"; ".join(found)}{Style.RESET_ALL}')
+            logging.warning(f'too wide selector as {name}: {";".join(found)}')
+    missing = [name for name, found in matches.items() if not found]
+    if missing:
+        raise ValueError(f'no employee data for {", ".join(missing)}')
+    pp_costs = pp_costs.copy()
+    pp_costs['fullname'] = [matches[name][0] for name in pp_costs.index.tolist()]
     pp_costs.set_index('fullname', inplace=True)  # full names added and reindex
     pp_costs['summary'] = pp_costs.sum(axis='columns')  # get summary column
     pp_costs = pp_costs.loc[(pp_costs.sum(axis=1) != 0), (pp_costs.sum(axis=0) != 0)]  # drop zero rows and cols
@@ -152,58 +252,36 @@ def main():
     # build persons data structure: project at day = time (time=min(table day time, rest_project_time until rpt=0)
 
     prj_names = list(pp_costs)[:-3]
+    time_cols = [c for c in emp_table.columns if re.match('^h\\d+$', c)]
+    emp_hours = emp_table[time_cols].to_numpy(dtype='int64')  # employees daily hours and presence
+    emp_pres = emp_table[[f'pres{c[1:]}' for c in time_cols]].to_numpy(dtype=object)
+    emp_rows = emp_table.index.get_indexer(pp_costs.index)
     pers_list = list()
-    for person, costs in pp_costs.iterrows():  # iterate persons and projects costs
-        emp_data = emp_table.loc[person]  # employee daily hours and presence
-        date = 1  # start at first day, select employee daily data
-        job = emp_data[f'h{date}']
-        presence = emp_data[f'pres{date}']
-        # prepare person dictionary
-        pers = {'name': person,
-                'num': emp_data['num'],
-                'spec': emp_data['spec'],
-                'projects': dict()}
-        # iterate projects those person participate
-        for project_name, project_cost in [x for x in zip(prj_names, list(costs)[:-3]) if x[1] > 0]:
-            pers['projects'].update({project_name: dict()})  # attach project to person
-            while not project_cost < 1:  # add project cost to days, day by day
-                spent = int(min(project_cost, job))  # how much we can spend to a day
-                if spent:
-                    pers['projects'][project_name].update({f'h{date}': spent,
-                                                           f'pres{date}': presence})  # add to project
-                    project_cost -= spent  # decrease project cost
-                    job -= spent  # decrease day job
-                if job < 1 and not project_cost < 1:  # if day job over, but need continue - take next day
-                    date += 1
-                    job = emp_data[f'h{date}']
-                    presence = emp_data[f'pres{date}']
-            # calc half-totals and totals
-            part1 = [val for key, val in pers['projects'][project_name].items()
-                     if re.match('^h(?:1[0-5]|[1-9])$', key) and type(val) is int]
-            part2 = [val for key, val in pers['projects'][project_name].items()
-                     if re.match('^h(1[6-9]|2\\d|3[0-1])$', key) and type(val) is int]
-            pers['projects'][project_name].update({
-                'hp1': sum(part1), 'dp1': len(part1),
-                'hp2': sum(part2), 'dp2': len(part2),
-                'sh': sum(part1) + sum(part2), 'sd': len(part1) + len(part2)})
-        pers_list.append(pers)
-
-    # fill empty days with default employee presence and zero times
-
-    for pers_data in pers_list:
-        for project in pers_data['projects']:
-            for date in range(1, 32):  # iterate max number of days: 1 to 31
-                if f'h{date}' not in pers_data['projects'][project]:  # is date empty
-                    try:  # if days exceeds month - we get KeyError from emp_table.loc
-                        if date > days_count:
-                            raise KeyError('outdated')
-                        pers_data['projects'][project].update(
-                            {f'h{date}': ' ',
-                             f'pres{date}': 'Н' if emp_table.loc[pers_data['name'], f'h{date}'] > 0
-                             else emp_table.loc[pers_data['name'], f'pres{date}']})
-                    except KeyError:
-                        pers_data['projects'][project].update(
-                            {f'h{date}': 'X', f'pres{date}': 'X'})
+    fresh = dict()  # {inputs fingerprint: person data} of the run
+    reused = 0
+    with profiler.stage('allocation'):
+        for person, row, costs in zip(pp_costs.index, emp_rows, pp_costs[prj_names].to_numpy()):
+            num, spec = emp_table['num'].iat[row], emp_table['spec'].iat[row]
+            costs = [(project, float(cost)) for project, cost in zip(prj_names, costs) if cost > 0]
+            if stored is not None:
+                key = fingerprint(person, num, spec, emp_hours[row].tolist(), emp_pres[row].tolist(), costs,
+                                  days_count)
+                if key in stored:
+                    fresh[key] = stored[key]
+                    pers_list.append(stored[key])
+                    reused += 1
+                    continue
+            pers = {'name': person,
+                    'num': num,
+                    'spec': spec,
+                    'projects': allocate(emp_hours[row], emp_pres[row], costs, days_count)}
+            pers_list.append(pers)
+            if stored is not None:
+                fresh[key] = pers
+    if stored is not None:
+        print(f'Allocation reused for {reused} of {len(pers_list)} persons.')
+        stored.clear()
+        stored.update(fresh)
 
     # build context: [projects [persons]]
 
@@ -222,13 +300,92 @@ def main():
                            for i, p in enumerate(ctx_pers_list, 1)]}
         p_dict.update(common_dict)
         context['projects'].append(p_dict)
+    return context
+
+
+def report(rep_period, table_filename=None, template='t-13-template v5.docx', split=None, jobs=None, today=None,
+           incremental=False):
+    """
+    Build and render T13 costs report of the month.
+    @param rep_period: report month date
+    @param table_filename: employees T13 table filename; default - "T13-yy-mm.xlsx"
+    @param template: template docx filename
+    @param split: projects count per document for parallel rendering to separate documents, see docx_render.export_split()
+    @param jobs: rendering processes count
+    @param today: report date, default - now
+    @param incremental: reuse allocation of unchanged persons and unchanged documents of the previous incremental
+    run, state is stored to "login-t13-yy-mm.state"
+    @return: list of stored documents filenames
+    """
+    from docx_render import export_sheet, export_split
+    today = dt.datetime.now(dt.timezone.utc) if today is None else today
+
+    # load projects/persons and boss
+    with profiler.stage('costs load'):
+        pp_costs, boss = load_costs(rep_period)
+    print(boss.loc[0, 1], boss.loc[1, 1])
+
+    # load and parse employee table
+    if table_filename is None:
+        table_filename = f'T13-{rep_period.strftime("%y-%m")}.xlsx'
+    with profiler.stage('HR parse'):
+        emp_table = import_hr_table(table_filename)
+    report_name = check_login() + f'-t13-{rep_period.strftime("%y-%m")}'
+    state = load_state(report_name + '.state') if incremental else {'persons': None, 'documents': None}
+    context = build_context(pp_costs, boss, emp_table, rep_period, today, state['persons'])
 
     # render and output
-    report_filename = ''.join(s for s in os.getlogin() if s.isalnum()) + f'-t13-{rep_period.strftime("%y-%m")}.docx'
-    export_sheet(context, args.template, report_filename)
+    report_filename = report_name + '.docx'
+    with profiler.stage('render'):
+        if split:
+            filenames = export_split(context, template, report_filename, split, jobs, state['documents'])
+        else:
+            export_sheet(context, template, report_filename, state['documents'])
+            filenames = [report_filename]
+    if incremental:
+        save_state(report_name + '.state', state)
+    return filenames
+
+
+def main():
+    # init
+
+    args = define_parser().parse_args()  # get CLI arguments
+    colorama_init()
+    logging.basicConfig(filename='costsheet.log',
+                        filemode='a',
+                        format='%(asctime)s %(name)s %(levelname)s %(message)s',
+                        datefmt='%d/%m/%y %H:%M:%S',
+                        level=logging.INFO if args.debug else logging.WARNING)
+    logging.info('Costsheet started.')
+
+    # define dates
+    # in not defined in argument - two first week set to previous month, otherwise - to current month
+    check_login()
+    if args.profile:
+        profiler.start(args.cprofile)
+    today = dt.datetime.now(dt.timezone.utc)
+    rep_period = today + dt.timedelta(days=-14) if args.date is None else args.date
+    print(f'Building costs report for {Fore.GREEN}{rep_period.strftime("%B %Y")}{Style.RESET_ALL}')
+
+    # Configure pandas to full output
+
+    with profiler.stage('imports'):
+        import pandas as pd
+    pd.set_option('display.max_rows', 700)
+    pd.set_option('display.max_columns', 500)
+    pd.set_option('display.width', 1000)
+
+    report(rep_period, None if args.table_filename == 'T13_default_table_name_magic_value' else args.table_filename,
+           args.template, args.split, args.jobs, today, args.incremental)
+    if args.profile:
+        from excel_io import cache_stats as workbook_cache_stats
+        profiler.save(args.profile_file, **{'workbook cache': workbook_cache_stats()})
+        print(f'{Fore.GREEN}Profile stored to {Fore.CYAN}{args.profile_file}{Style.RESET_ALL}')
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # rendering processes of frozen executable
     try:
         main()
     except Exception as e:
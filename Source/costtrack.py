@@ -1,16 +1,18 @@
-from yandex_tracker_client import TrackerClient
 import configparser
 import logging
-import pandas as pd
-from alive_progress import alive_bar
 import datetime as dt
 import argparse
 import os
-from data_access import issue_times, iso_hrs, linked_issues
+import re
+import time
+from profiling import profiler, json_filename
 from colorama import init as colorama_init
 from colorama import Fore
 from colorama import Style
 
+# heavy modules (pandas, numpy, Tracker client, progress bars) are imported by the functions using them:
+# help, arguments and input errors are answered without loading them, see README "Startup"
+
 
 def define_parser():
     """ Return CLI arguments parser
@@ -19,28 +21,145 @@ def define_parser():
                                      epilog='Tracker connection settings in "connect.ini".')
     parser.add_argument('filename', nargs='?', default='ScanData.xlsx',
                         help='input excel projects and persons config; default - "ScanData.xlsx"')
-    parser.add_argument('-d', '--date', metavar='REPORT_DATE',
+    period = parser.add_mutually_exclusive_group()  # single month or batch months range
+    period.add_argument('-d', '--date', metavar='REPORT_DATE',
                         type=lambda s: dt.datetime.strptime(s, '%y-%m'),
                         help='specify report period in "y-m" format (like "25-1" for january 2025); '
                              'default - previous month until 14th, current month since 15th')
+    period.add_argument('--from', metavar='FIRST_DATE', dest='first',
+                        type=lambda s: dt.datetime.strptime(s, '%y-%m'),
+                        help='batch mode: first report period in "y-m" format, one crawl for all the months')
+    parser.add_argument('--to', metavar='LAST_DATE', dest='last',
+                        type=lambda s: dt.datetime.strptime(s, '%y-%m'),
+                        help='batch mode: last report period in "y-m" format; default - same as --from')
+    parser.add_argument('--combined', default=False, action='store_true',
+                        help='batch mode: store all the months to one workbook, sheet per month')
+    parser.add_argument('--output', choices=['xlsx', 'npz', 'both'], default='xlsx',
+                        help='costs output: "xlsx" workbook, "npz" columnar file with per issue aggregates '
+                             '(fast to store and to load by costsheet) or both; default - xlsx')
+    parser.add_argument('--cache', metavar='CACHE_FILE', default='costtrack.cache',
+                        help='persistent Tracker data cache filename; default - "costtrack.cache"')
+    parser.add_argument('--refresh', default=False, action='store_true',
+                        help='ignore cached Tracker data, reload all from Tracker')
+    parser.add_argument('--cache-entries', metavar='N', type=int, default=20000,
+                        help='in-memory Tracker data cache limit, issues; default - 20000')
+    parser.add_argument('-w', '--workers', metavar='N', type=int, default=8,
+                        help='concurrent Tracker requests count; default - 8')
+    parser.add_argument('--host-limit', metavar='N', type=int,
+                        help='throttle: max concurrent Tracker requests, below workers count; default - workers count')
+    parser.add_argument('--profile', default=False, action='store_true',
+                        help='store stages time, Tracker calls and caches statistics to JSON file')
+    parser.add_argument('--profile-file', metavar='JSON_FILE', type=json_filename, default='costtrack-profile.json',
+                        help='with --profile: profile filename; default - "costtrack-profile.json"')
+    parser.add_argument('--cprofile', default=False, action='store_true',
+                        help='with --profile: store cProfile statistics to .prof file of the same name')
     parser.add_argument('--debug', default=False, action='store_true',
                         help='logging in debug mode (include tracker and issues info)')
     parser.set_defaults(add_name=True)
     return parser
 
 
-def spend(issue, person, start, final):
+def move_cost(person):
+    """ Return person status move cost, zero if not defined """
     try:
-        lc = int(person['move_cost'])
+        return int(person['move_cost'])
     except ValueError:
-        lc = 0
-    sp = sum(((iso_hrs(x['value']) - iso_hrs(x['from'])) if x['kind'] == 'spent' else lc)
-             for x in issue_times(issue)
-             if login_match(person['login'], x['by']) and
-             x['kind'] in ['spent', 'status'] and
-             start.date() <= x['date'].date() <= final.date()
-             )
-    return sp
+        return 0
+
+
+def in_period(issue, start, final) -> bool:
+    """ Check issue lifetime intersects report period """
+    return (dt.datetime.strptime(issue.updatedAt, '%Y-%m-%dT%H:%M:%S.%f%z').date() >= start.date() and
+            dt.datetime.strptime(issue.createdAt, '%Y-%m-%dT%H:%M:%S.%f%z').date() <= final.date())
+
+
+def report_months(first, last):
+    """ Return list of (start, final) datetimes of report months, from first to last month inclusive """
+    months = list()
+    start = first.replace(day=1)
+    while start.date() <= last.date():
+        final = (start.replace(day=28) + dt.timedelta(days=4)).replace(day=1) + dt.timedelta(days=-1)
+        months.append((start, final))
+        start = final + dt.timedelta(days=1)
+    return months
+
+
+def aggregate(issues, registry, persons, periods, directory=None, progress=None, entries=None):
+    """
+    Costs aggregation over columnar changes store: each issue changelog is read once,
+    spent deltas and status moves are bucketed by report months, matched persons and projects
+    with vectorized masks and group-by.
+    @param issues: dict {issue key: issue}
+    @param registry: dict {project name: list of issue keys}
+    @param persons: persons dataframe (name, login, move_cost)
+    @param periods: list of report months (start, final) datetimes, see report_months()
+    @param directory: optional UserDirectory, changelog authors resolved by account id
+    @param progress: optional callable, invoked once per issue
+    @param entries: optional list, filled with per issue aggregates dataframes (name, project, key, kind, value),
+    one per report month
+    @return: list of persons x projects costs dataframes, one per report month
+    """
+    import numpy as np
+    import pandas as pd
+    from data_access import times_frame
+    actual = dict()  # issues intersecting any of report months
+    for key, issue in issues.items():
+        if any(in_period(issue, *period) for period in periods):
+            actual[key] = issue
+        elif progress is not None:
+            progress()
+    times = times_frame(actual, min(start for start, _ in periods).date(), progress)
+
+    # bucket changes by report months, drop changes out of issue lifetime in the month
+    months = pd.Series(range(len(periods)), index=[start.year * 12 + start.month - 1 for start, _ in periods])
+    times = times[times['kind'].isin(['spent', 'status'])]
+    times = times.assign(period=times['month'].map(months)).dropna(subset=['period']).astype({'period': 'int64'})
+    period = times['period'].to_numpy()
+    created = pd.Series({key: dt.datetime.strptime(issue.createdAt, '%Y-%m-%dT%H:%M:%S.%f%z').toordinal()
+                         for key, issue in actual.items()}, dtype='int64')
+    updated = pd.Series({key: dt.datetime.strptime(issue.updatedAt, '%Y-%m-%dT%H:%M:%S.%f%z').toordinal()
+                         for key, issue in actual.items()}, dtype='int64')
+    starts = np.array([start.toordinal() for start, _ in periods], dtype='int64')
+    finals = np.array([final.toordinal() for _, final in periods], dtype='int64')
+    keys = times['key'].astype(str)
+    times = times[(keys.map(created).to_numpy() <= finals[period]) & (keys.map(updated).to_numpy() >= starts[period])]
+
+    # match changes authors to persons: by account id if known in directory, otherwise by display name
+    selectors = [(person['name'], person['login'], move_cost(person)) for _, person in persons.iterrows()]
+    accounts = dict()  # account id: [(person name, move cost)]
+    if directory is not None:
+        for name, login, lc in selectors:
+            for uid in directory.select(login):
+                accounts.setdefault(uid, list()).append((name, lc))
+    authors = times[['uid', 'by']].drop_duplicates().astype(str)
+    matches = pd.DataFrame([(uid, by, name, lc) for uid, by in authors.itertuples(index=False)
+                            for name, lc in (accounts.get(uid, []) if directory is not None and uid in directory
+                                             else [(name, lc) for name, login, lc in selectors
+                                                   if login_match(login, by)])],
+                           columns=['uid', 'by', 'name', 'lc'])
+    owners = pd.DataFrame([(key, project) for project, keys in registry.items() for key in keys],
+                          columns=['key', 'project'])
+    times = times.astype({'key': str, 'uid': str, 'by': str}) \
+        .merge(matches, on=['uid', 'by']) \
+        .merge(owners, on='key')
+    times['value'] = np.where(times['kind'] == 'spent', times['hours'], times['lc'])
+    costs = times.groupby(['period', 'name', 'project'])['value'].sum()
+    if entries is not None:
+        details = times.groupby(['period', 'name', 'project', 'key', 'kind'], sort=False)['value'].sum() \
+            .astype('int64').reset_index()  # same dtype as reports
+        entries.extend(details[details['period'] == n].drop(columns='period').reset_index(drop=True)
+                       for n in range(len(periods)))
+
+    reports = list()
+    for n in range(len(periods)):
+        if n in costs.index.get_level_values('period'):
+            report = costs.xs(n, level='period').unstack('project', fill_value=0)
+        else:
+            report = pd.DataFrame()
+        reports.append(report.reindex(index=persons['name'].values.tolist(),
+                                      columns=list(registry), fill_value=0)
+                       .rename_axis(index=None, columns=None).astype('int64'))
+    return reports
 
 
 def login_match(login, user) -> bool:
@@ -61,95 +180,184 @@ def users_jaccard(users):
     return min([len(set(user) & union) / len(set(user) | union) for user in users], default=1.0)
 
 
-def get_issues(client, request):
+def period_query(request, start, final):
+    """ Return Tracker query limited to issues updated since period start and created until period final """
+    order = re.search(r'"?sort\s+by"?\s*:', request, re.IGNORECASE)  # sort clause must stay at the end
+    query, order = (request[:order.start()], request[order.start():]) if order else (request, '')
+    # one day margins cover Tracker user timezone, exact check is in_period()
+    return (f'({query.strip()}) '
+            f'AND Updated: >= "{(start - dt.timedelta(days=1)).strftime("%Y-%m-%d")}" '
+            f'AND Created: <= "{(final + dt.timedelta(days=1)).strftime("%Y-%m-%d")}" {order}').strip()
+
+
+def subtree(client, roots, fetcher=None):
+    """
+    Return dict {issue key: issue} of subtasks trees issues, roots included.
+    Trees are walked breadth-first with visited set, so shared subtasks and links cycles are expanded once;
+    every level issues are loaded by bulk keys queries. Resolved tree nodes are stored with their updatedAt:
+    tree with none of nodes updated is loaded by its nodes keys, without walk.
+    Stored tree (and stored issue subtasks, see subtask_keys()) relies on subtask linking moving updatedAt:
+    a subtask unlinked or re-parented changes the tree nodes (either end of the link), but a new subtask linked
+    is noticed only by its parent updatedAt. Tracker API does not document it, so trees walked with fresh
+    links more than TREE_MAX_AGE ago are walked anew with links loaded from Tracker: a missed link
+    is kept at most TREE_MAX_AGE (a day); use --refresh to walk all the trees now.
+    @param client: Tracker client
+    @param roots: list of trees roots keys
+    @param fetcher: optional Fetcher for concurrent requests
+    """
+    from data_access import subtask_keys, issues_by_keys, cached_tree, store_tree, KEYS_BATCH, TREE_MAX_AGE
+    fetch = fetcher.map if fetcher is not None else lambda func, items: [func(i) for i in items]
+    known = dict()  # loaded issues
+
+    def load(keys):
+        keys = [k for k in dict.fromkeys(keys) if k not in known]
+        batches = [keys[i:i + KEYS_BATCH] for i in range(0, len(keys), KEYS_BATCH)]
+        for issues in fetch(lambda batch: issues_by_keys(client, batch), batches):
+            known.update((issue.key, issue) for issue in issues)
+
+    found = dict()
+    for root in dict.fromkeys(roots):
+        if root in found:  # already walked as other tree subtask
+            continue
+        stored = cached_tree(root)
+        fresh = stored is None or time.time() - stored[1] > TREE_MAX_AGE
+        if not fresh:
+            nodes, walked = stored
+            load(nodes)
+            if all(key in known and known[key].updatedAt == updated for key, updated in nodes.items()):
+                found.update((key, known[key]) for key in nodes)
+                continue
+        level = [root]
+        visited = {root}
+        while level:
+            load(level)
+            level = [key for key in level if key in known]
+            children = fetch(lambda key: subtask_keys(known[key], fresh), level)
+            level = list(dict.fromkeys(key for keys in children for key in keys if key not in visited))
+            visited.update(level)
+        if root not in known:
+            logging.warning(f'subtasks tree root {root} not found')
+        nodes = {key: known[key].updatedAt for key in visited if key in known}
+        store_tree(root, nodes, time.time() if fresh else walked)
+        found.update((key, known[key]) for key in nodes)
+    return found
+
+
+def get_issues(client, request, fetcher=None, period=None):
+    """ Return list of issues by Tracker query or by '#KEY,...' subtasks tree roots, see subtree().
+    If period (start, final) defined, only issues intersecting it are returned:
+    query is limited on server side, subtasks tree results filtered. """
     if len(request) == 0:
         return list()
     if request[0] == "#":
-        ancestors = [i.strip() for i in request[1:].split(',')]
-        keys = set(ancestors.copy())
-        while ancestors:
-            child = [i.key for i in linked_issues(client.issues[ancestors.pop()])]
-            keys.update(child)
-            ancestors.extend(child)
-        return [client.issues[k] for k in keys]
+        issues = list(subtree(client, [i.strip() for i in request[1:].split(',')], fetcher).values())
+        return issues if period is None else [i for i in issues if in_period(i, *period)]
     else:
-        return list(client.issues.find(query=request))
-
-
-def main():
-    # init
-
-    args = define_parser().parse_args()  # get CLI arguments
-    colorama_init()
-    logging.basicConfig(filename='costsheet.log',
-                        filemode='a',
-                        format='%(asctime)s %(name)s %(levelname)s %(message)s',
-                        datefmt='%d/%m/%y %H:%M:%S',
-                        level=logging.INFO if args.debug else logging.WARNING)
-    logging.info('Costtrack started.')
-
-    # Configure pandas to full output
-
-    pd.set_option('display.max_rows', 500)
-    pd.set_option('display.max_columns', 500)
-    pd.set_option('display.width', 1000)
+        query = request if period is None else period_query(request, *period)
+        if fetcher is not None:
+            return fetcher.call(lambda: list(client.issues.find(query=query)))
+        return list(client.issues.find(query=query))
 
-    # check input file present
-
-    if not os.path.isfile(args.filename):
-        raise ValueError(f'{args.filename} is not a file!')
-
-    # define dates
-    # in not defined in argument - two first week set to previous month, otherwise - to current month
-
-    date = dt.datetime.now(dt.timezone.utc) + dt.timedelta(days=-14) if args.date is None else args.date
-    start_date = date.replace(day=1)
-    final_date = (date.replace(day=28) + dt.timedelta(days=4)).replace(day=1) + dt.timedelta(days=-1)
-    print(f'Gathering costs report for {Fore.GREEN}{date.strftime("%B %Y")}{Style.RESET_ALL}')
-
-    # configure and establish Tracker connection
 
+def resolve_projects(client, projects, fetcher=None, period=None, progress=None):
+    """
+    Build issues registry: every project request resolved once, issue objects shared between projects.
+    @param client: Tracker client
+    @param projects: projects dataframe (name, request)
+    @param fetcher: optional Fetcher for concurrent requests
+    @param period: optional (start, final) datetimes, limits issues to intersecting the period
+    @param progress: optional callable, invoked once per project
+    @return: tuple of dict {issue key: issue} and dict {project name: list of issue keys}
+    """
+    issues = dict()
+    registry = dict()
+    for _, project in projects.iterrows():
+        found = get_issues(client, project['request'], fetcher, period)
+        for issue in found:
+            issues.setdefault(issue.key, issue)
+        registry[project['name']] = list(dict.fromkeys(issue.key for issue in found))
+        if progress is not None:
+            progress()
+    return issues, registry
+
+
+def default_month():
+    """ Return default report month date: previous month until 14th, current month since 15th """
+    return dt.datetime.now(dt.timezone.utc) + dt.timedelta(days=-14)
+
+
+def connect(filename='connect.ini'):
+    """ Return Tracker client, connection settings (token and org) are read from ini file.
+    Client own retries are disabled: requests are retried with backoff by prefetch.Fetcher """
+    from yandex_tracker_client import TrackerClient
     config = configparser.ConfigParser()
-    config.read('connect.ini')
+    config.read(filename)
     assert 'token' in config['DEFAULT']
     assert 'org' in config['DEFAULT']
     creds = config['DEFAULT']
-    client = TrackerClient(creds['token'], creds['org'])
+    client = TrackerClient(creds['token'], creds['org'], retries=0)
     if client.myself is None:
         raise Exception('Unable to connect Yandex Tracker.')
+    return client
 
-    # reading boss data (just for copy to output)
-
-    boss = pd.read_excel(args.filename, sheet_name='Boss', header=None)
-    print(boss)
-
-    # reading projects data
-
-    projects = pd.read_excel(args.filename,
-                             sheet_name='Projects',
-                             header=None, index_col=None,
-                             usecols=[0, 1], skiprows=1,
-                             names=['name', 'request'])
-    print()
-    projects['size'] = 0
-    with alive_bar(len(projects), title='Projects', theme='classic') as bar:
-        for index_prj, project in projects.iterrows():
-            projects.at[index_prj, 'size'] = len(get_issues(client, project['request']))
-            bar()
-    print(projects)
-
-    # reading persons data
 
-    persons = pd.read_excel(args.filename,
-                            sheet_name='Persons',
-                            header=None, index_col=None,
-                            usecols=[0, 1, 2], skiprows=1,
-                            names=['name', 'login', 'move_cost'])
-    print()
+def collect(client, filename, periods, fetcher, directory=None, verbose=True, entries=None):
+    """
+    Gather persons projects costs from Tracker.
+    @param client: Tracker client
+    @param filename: input excel projects and persons config
+    @param periods: list of (start, final) report periods, see report_months()
+    @param fetcher: Fetcher for concurrent Tracker requests
+    @param directory: UserDirectory, loaded if not defined
+    @param verbose: print config tables and progress bars
+    @param entries: optional list, filled with per issue aggregates, see aggregate()
+    @return: tuple of (boss dataframe, list of costs reports, one per period)
+    """
+    from alive_progress import alive_bar
+    from data_access import issue_times, UserDirectory
+    from excel_io import read_sheets
+    start_date, final_date = periods[0][0], periods[-1][1]
+
+    # reading config workbook: boss, projects and persons sheets at once
+
+    with profiler.stage('config load'):
+        config_sheets = read_sheets(filename, {
+            'Boss': dict(header=None),
+            'Projects': dict(header=None, index_col=None, usecols=[0, 1], skiprows=1, names=['name', 'request']),
+            'Persons': dict(header=None, index_col=None, usecols=[0, 1, 2], skiprows=1,
+                            names=['name', 'login', 'move_cost'])})
+
+    # boss data (just for copy to output)
+
+    boss = config_sheets['Boss']
+    if verbose:
+        print(boss)
+
+    # projects data
+
+    projects = config_sheets['Projects']
+    if verbose:
+        print()
+    with alive_bar(len(projects), title='Projects', theme='classic', disable=not verbose) as bar, \
+            profiler.stage('issue resolution'):
+        issues, registry = resolve_projects(client, projects, fetcher, (start_date, final_date), progress=bar)
+    projects['size'] = [len(registry[name]) for name in projects['name']]
+    if verbose:
+        print(projects)
+
+    # persons data
+
+    persons = config_sheets['Persons']
+    if verbose:
+        print()
     persons['accounts'] = ''
-    with alive_bar(len(persons), title='Persons', theme='classic') as bar:
+    with profiler.stage('user resolution'):
+        if directory is None:
+            directory = fetcher.call(UserDirectory.load, client)
+    with alive_bar(len(persons), title='Persons', theme='classic', disable=not verbose) as bar, \
+            profiler.stage('user resolution'):
         for index_pers, person in persons.iterrows():
-            users_list = [user.display for user in client.users if login_match(person['login'], user)]
+            users_list = [directory.display(uid) for uid in directory.select(person['login'])]
             jf = users_jaccard([a.split('@')[0].lower() for a in users_list])
             warn = ''
             if jf < 0.8:
@@ -161,38 +369,134 @@ def main():
                 logging.warning(f'no accounts for {person["login"]}')
                 persons.at[index_pers, 'accounts'] = f'{Fore.RED}WARNING: no accounts!{Style.RESET_ALL}'
             bar()
-    print(persons)
+    if verbose:
+        print(persons)
 
     # acquiring data from Tracker
 
-    # print()
-    report = pd.DataFrame(0,
-                          index=persons['name'].values.tolist(),
-                          columns=projects['name'].values.tolist())
-    with alive_bar(int(len(persons) * sum(projects['size'].values)),
-                   title='Costs', theme='classic') as bar:
-        for _, project in projects.iterrows():
-            issues = get_issues(client, project['request'])
-            for _, person in persons.iterrows():
-                s = 0
-                for issue in issues:
-                    if (dt.datetime.strptime(issue.updatedAt, '%Y-%m-%dT%H:%M:%S.%f%z').date()
-                        >= start_date.date()) and (
-                            dt.datetime.strptime(issue.createdAt, '%Y-%m-%dT%H:%M:%S.%f%z').date()
-                            <= final_date.date()):
-                        s += spend(issue, person, start_date, final_date)
-                    bar()
-                report.at[person['name'], project['name']] = s
+    actual = [issue for issue in issues.values() if in_period(issue, start_date, final_date)]
+    with alive_bar(len(actual), title='Changelogs', theme='classic', disable=not verbose) as bar, \
+            profiler.stage('changelog fetch'):
+        fetcher.map(lambda i: issue_times(i, start_date.date()), actual, progress=bar)  # prefetch into cache
+    with alive_bar(len(issues), title='Costs', theme='classic', disable=not verbose) as bar, \
+            profiler.stage('cost aggregation'):
+        reports = aggregate(issues, registry, persons, periods, directory, progress=bar, entries=entries)
     # print(report)  # disable due non-readable output format
+    return boss, reports
+
+
+def store_reports(boss, periods, reports, combined=False, output='xlsx', entries=None):
+    """
+    Store costs reports to "costs-yy-mm.xlsx" workbooks, one per period,
+    or to one "costs-yy-mm-yy-mm.xlsx" workbook with sheet per period if combined.
+    Columnar "costs-yy-mm.npz" files (see columnar.py) are stored per period, combined or not,
+    after the workbooks: costsheet takes the most recently stored file, see costsheet.load_costs().
+    @param output: 'xlsx' - workbooks, 'npz' - columnar files, 'both'
+    @param entries: optional per issue aggregates for columnar files, see aggregate()
+    @return: list of stored filenames
+    """
+    import pandas as pd
+    filenames = list()
+    if output in ['xlsx', 'both']:
+        if combined:
+            report_name = f'costs-{periods[0][0].strftime("%y-%m")}-{periods[-1][1].strftime("%y-%m")}.xlsx'
+            with pd.ExcelWriter(report_name) as writer:
+                boss.to_excel(writer, sheet_name='boss', header=False, index=False)
+                for (start, _), report in zip(periods, reports):
+                    report.to_excel(writer, sheet_name=f'costs-{start.strftime("%y-%m")}')
+            filenames.append(report_name)
+        else:
+            for (start, _), report in zip(periods, reports):
+                report_name = f'costs-{start.strftime("%y-%m")}.xlsx'
+                with pd.ExcelWriter(report_name) as writer:
+                    boss.to_excel(writer, sheet_name='boss', header=False, index=False)
+                    report.to_excel(writer, sheet_name='costs')
+                    # use writer to save multiple dataframes as sheets in one file
+                filenames.append(report_name)
+    if output in ['npz', 'both']:
+        from columnar import store_costs
+        for n, ((start, _), report) in enumerate(zip(periods, reports)):
+            report_name = f'costs-{start.strftime("%y-%m")}.npz'
+            store_costs(report_name, boss, report, None if entries is None else entries[n])
+            filenames.append(report_name)
+    return filenames
+
+
+def main():
+    # init
+
+    parser = define_parser()
+    args = parser.parse_args()  # get CLI arguments
+    if args.last is not None and args.first is None:
+        parser.error('--to requires --from')
+    colorama_init()
+    logging.basicConfig(filename='costsheet.log',
+                        filemode='a',
+                        format='%(asctime)s %(name)s %(levelname)s %(message)s',
+                        datefmt='%d/%m/%y %H:%M:%S',
+                        level=logging.INFO if args.debug else logging.WARNING)
+    logging.info('Costtrack started.')
+
+    # check input file present
+
+    if not os.path.isfile(args.filename):
+        raise ValueError(f'{args.filename} is not a file!')
+
+    # define dates
+    # in not defined in argument - two first week set to previous month, otherwise - to current month
+
+    if args.first is not None:
+        periods = report_months(args.first, args.first if args.last is None else args.last)
+        if not periods:
+            raise ValueError('Empty report periods range!')
+    else:
+        date = default_month() if args.date is None else args.date
+        periods = report_months(date, date)
+    start_date, final_date = periods[0][0], periods[-1][1]
+    print(f'Gathering costs report for {Fore.GREEN}{start_date.strftime("%B %Y")}'
+          f'{"" if len(periods) == 1 else " - " + final_date.strftime("%B %Y")}{Style.RESET_ALL}')
+    if args.profile:
+        profiler.start(args.cprofile)
+
+    # Configure pandas to full output
+
+    with profiler.stage('imports'):
+        import pandas as pd
+        from data_access import use_store, set_cache_size, cache_stats
+        from cache_store import CacheStore
+        from prefetch import Fetcher
+        from excel_io import cache_stats as workbook_cache_stats
+    pd.set_option('display.max_rows', 500)
+    pd.set_option('display.max_columns', 500)
+    pd.set_option('display.width', 1000)
+
+    # configure and establish Tracker connection
+
+    with profiler.stage('tracker connect'):
+        client = profiler.watch(connect())
+    store = CacheStore(args.cache, refresh=args.refresh)
+    use_store(store)
+    set_cache_size(args.cache_entries)
+    fetcher = Fetcher(workers=args.workers, host_limit=args.host_limit)
+
+    entries = None if args.output == 'xlsx' else list()
+    boss, reports = collect(client, args.filename, periods, fetcher, entries=entries)
+    fetcher.close()
+    stats = {'memory cache': cache_stats(), 'persistent cache': store.stats(),
+             'workbook cache': workbook_cache_stats()}
+    logging.info(f'Memory cache statistics: {stats["memory cache"]}')
+    logging.info(f'Persistent cache statistics: {stats["persistent cache"]}')
+    store.close()
 
     # store the report
 
-    report_name = f'costs-{date.strftime("%y-%m")}.xlsx'
-    with pd.ExcelWriter(report_name) as writer:
-        boss.to_excel(writer, sheet_name='boss', header=False, index=False)
-        report.to_excel(writer, sheet_name='costs')
-        # use writer to save multiple dataframes as sheets in one file
-    print(f'\n{Fore.GREEN}Report successfully stored to {Fore.CYAN}{report_name}{Style.RESET_ALL}')
+    with profiler.stage('workbook write'):
+        report_names = store_reports(boss, periods, reports, args.combined, args.output, entries)
+    for report_name in report_names:
+        print(f'\n{Fore.GREEN}Report successfully stored to {Fore.CYAN}{report_name}{Style.RESET_ALL}')
+    if args.profile:
+        profiler.save(args.profile_file, **stats)
+        print(f'{Fore.GREEN}Profile stored to {Fore.CYAN}{args.profile_file}{Style.RESET_ALL}')
 
 
 if __name__ == '__main__':
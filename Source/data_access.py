@@ -1,7 +1,73 @@
-from functools import lru_cache
+from collections import namedtuple, OrderedDict
+from functools import wraps
 import datetime as dt
+import sys
+import threading
+import pandas as pd
 from yandex_tracker_client.exceptions import Forbidden
 
+_store = None  # persistent cache store, see use_store()
+_caches = list()  # in-memory caches of Tracker data, see KeyCache
+
+
+def use_store(store):
+    """ Attach persistent cache store (CacheStore or None) to Tracker data access """
+    global _store
+    _store = store
+
+
+class KeyCache:
+    """ Bounded LRU cache decorator for Tracker data access functions.
+    Keyed by issue key and updatedAt (plus extra arguments), so issue objects are not kept alive.
+    Counts hits, misses and evictions. """
+
+    def __init__(self, name, maxsize=20000):
+        self.name = name
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()  # shared by prefetch threads
+        self.hits = self.misses = self.evictions = 0
+        _caches.append(self)
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(issue, *args):
+            key = (issue.key, issue.updatedAt) + args
+            with self.lock:
+                if key in self.data:
+                    self.hits += 1
+                    self.data.move_to_end(key)
+                    return self.data[key]
+                self.misses += 1
+            value = func(issue, *args)
+            with self.lock:
+                self.data[key] = value
+                while len(self.data) > self.maxsize:
+                    self.data.popitem(last=False)
+                    self.evictions += 1
+            return value
+        wrapper.cache = self
+        return wrapper
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+    def stats(self):
+        return {'size': len(self.data), 'maxsize': self.maxsize,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+def set_cache_size(maxsize):
+    """ Set entries limit of all in-memory Tracker data caches """
+    for cache in _caches:
+        cache.maxsize = maxsize
+
+
+def cache_stats():
+    """ Return dict {cache name: statistics dict} of in-memory Tracker data caches """
+    return {cache.name: cache.stats() for cache in _caches}
+
 
 def _iso_split(s, split):
     """ Splitter helper for converting ISO dt notation"""
@@ -30,23 +96,80 @@ def iso_hrs(s):
     return (weeks * 5 + days) * 8 + hours
 
 
-@lru_cache(maxsize=None)  # Caching access to YT
-def issue_times(issue):
-    """ Return reverse-sorted by time list of issue spends, estimates, status and resolution changes"""
-    sp = [{'date': dt.datetime.strptime(log.updatedAt, '%Y-%m-%dT%H:%M:%S.%f%z'),
-           'by': log.updatedBy.display,
-           'kind': field['field'].id,
-           'value': field['to'] if field['field'].id in ['spent', 'estimation']
-           else field['to'].key if field['to'] is not None else '',
-           'from': field['from'] if field['field'].id in ['spent', 'estimation']
-           else field['from'].key if field['from'] is not None else ''}
-          for log in issue.changelog for field in log.fields
-          if field['field'].id in ['spent', 'estimation', 'resolution', 'status']]
-    sp.sort(key=lambda d: d['date'], reverse=True)
+TIME_FIELDS = ['spent', 'estimation', 'resolution', 'status']
+
+# Issue change record:
+# stamp - epoch milliseconds, day - date ordinal, month - year * 12 + month - 1 (dates in change timezone),
+# uid, by - author account id and display name, kind - changed field id,
+# hours - spent or estimation delta (zero for other kinds), value - new status or resolution key
+Change = namedtuple('Change', ['stamp', 'day', 'month', 'uid', 'by', 'kind', 'hours', 'value'])
+
+
+def _change(stamp, day, month, uid, by, kind, hours, value):
+    """ Return change record with interned strings """
+    return Change(stamp, day, month, sys.intern(uid), sys.intern(by), sys.intern(kind), hours, sys.intern(value))
+
+
+@KeyCache('issue_times')  # Caching access to YT
+def issue_times(issue, since=None):
+    """ Return reverse-sorted by time list of issue spends, estimates, status and resolution changes (Change).
+    Changelog requested newest first and filtered by fields on server side;
+    if since date defined, reading stops at it and older changes omitted. """
+    if _store is not None:
+        sp = _store.get_times(issue.key, issue.updatedAt, since)
+        if sp is not None:
+            return [_change(*x) for x in sp]
+    sp = list()
+    for log in issue.changelog.get_all(sort='desc', field=TIME_FIELDS):
+        date = dt.datetime.strptime(log.updatedAt, '%Y-%m-%dT%H:%M:%S.%f%z')
+        if since is not None and date.date() < since:
+            break
+        stamp, day, month = int(date.timestamp() * 1000), date.toordinal(), date.year * 12 + date.month - 1
+        uid, by = str(log.updatedBy.id), log.updatedBy.display
+        for field in log.fields:
+            kind = field['field'].id
+            if kind in ['spent', 'estimation']:
+                sp.append(_change(stamp, day, month, uid, by, kind,
+                                  iso_hrs(field['to']) - iso_hrs(field['from']), ''))
+            elif kind in TIME_FIELDS:
+                sp.append(_change(stamp, day, month, uid, by, kind,
+                                  0, field['to'].key if field['to'] is not None else ''))
+    sp.sort(key=lambda x: x.stamp, reverse=True)
+    if _store is not None:
+        _store.put_times(issue.key, issue.updatedAt, sp, since)
     return sp
 
 
-@lru_cache(maxsize=None)  # Caching access to YT
+def times_frame(issues, since=None, progress=None):
+    """
+    Return columnar store of issues changes: one row per change,
+    categorical key/uid/by/kind columns, int64 day (date ordinal), month (year * 12 + month - 1)
+    and hours (spent or estimation delta, zero for other kinds).
+    @param issues: dict {issue key: issue}
+    @param since: optional date, older changes may be omitted
+    @param progress: optional callable, invoked once per issue
+    """
+    keys = list()
+    records = list()
+    for key, issue in issues.items():
+        times = issue_times(issue, since)
+        keys.extend([key] * len(times))
+        records.extend(times)
+        if progress is not None:
+            progress()
+    frame = pd.DataFrame.from_records(records, columns=Change._fields)
+    frame.insert(0, 'key', keys)
+    return frame[['key', 'day', 'month', 'uid', 'by', 'kind', 'hours']] \
+        .astype({'key': 'category', 'uid': 'category', 'by': 'category',
+                 'kind': 'category', 'day': 'int64', 'month': 'int64', 'hours': 'int64'})
+
+
+def _is_subtask(link):
+    """ Check issue link points to subtask """
+    return link.type.id == 'subtask' and \
+        dict(outward=link.type.inward, inward=link.type.outward)[link.direction] == 'Подзадача'
+
+
 def linked_issues(issue):
     def _accessible(someone):
         try:
@@ -56,7 +179,75 @@ def linked_issues(issue):
         return x
 
     """ Return list of issue linked subtasks """
-    return [link.object for link in issue.links
-            if link.type.id == 'subtask' and
-            dict(outward=link.type.inward, inward=link.type.outward)[link.direction] == 'Подзадача' and
-            _accessible(link.object)]
+    return [link.object for link in issue.links if _is_subtask(link) and _accessible(link.object)]
+
+
+@KeyCache('subtask_keys')  # Caching access to YT
+def subtask_keys(issue, fresh=False):
+    """ Return list of issue linked subtasks keys.
+    Linked issues are not requested: inaccessible ones are dropped by the keys query, see issues_by_keys().
+    Stored keys are valid while issue updatedAt is the same (subtask linking is expected to update the parent);
+    fresh - ignore stored keys, load links from Tracker """
+    if _store is not None and not fresh:
+        keys = _store.get_links(issue.key, issue.updatedAt)
+        if keys is not None:
+            return keys
+    keys = [link.object.key for link in issue.links if _is_subtask(link)]
+    if _store is not None:
+        _store.put_links(issue.key, issue.updatedAt, keys)
+    return keys
+
+
+KEYS_BATCH = 100  # issues per bulk keys query
+TREE_MAX_AGE = 86400  # seconds, stored subtasks trees older than this are walked with fresh links
+
+
+def issues_by_keys(client, keys):
+    """ Return list of issues by keys with one bulk query (up to KEYS_BATCH keys),
+    absent and inaccessible issues are omitted """
+    return list(client.issues.find(keys=list(keys), per_page=len(keys))) if keys else list()
+
+
+def cached_tree(root):
+    """ Return stored subtasks tree of root issue: (nodes {key: updatedAt}, walk timestamp) or None """
+    return _store.get_tree(root) if _store is not None else None
+
+
+def store_tree(root, nodes, walked):
+    """ Store subtasks tree nodes {key: updatedAt} of root issue, walked - fresh links walk timestamp """
+    if _store is not None:
+        _store.put_tree(root, nodes, walked)
+
+
+class UserDirectory:
+    """ Tracker users index: account id, login and lower-cased display name.
+    Loaded once per run (and kept in persistent store for a day). """
+
+    def __init__(self, users):
+        """
+        @param users: list of (id, login, display) tuples
+        """
+        self.users = {uid: (login, display) for uid, login, display in users}
+        self._lower = [(uid, display.lower()) for uid, (_, display) in self.users.items()]
+
+    @classmethod
+    def load(cls, client):
+        """ Return directory of all Tracker users """
+        day = dt.date.today().isoformat()
+        users = _store.get_users(day) if _store is not None else None
+        if users is None:
+            users = [(str(user.uid), user.login or '', user.display or '') for user in client.users]
+            if _store is not None:
+                _store.put_users(day, users)
+        return cls(users)
+
+    def __contains__(self, uid):
+        return uid in self.users
+
+    def display(self, uid):
+        return self.users[uid][1]
+
+    def select(self, selector):
+        """ Return list of account ids with display name matching selector (case-insensitive substring) """
+        selector = selector.lower()
+        return [uid for uid, display in self._lower if selector in display]
@@ -0,0 +1,132 @@
+import hashlib
+import io
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from colorama import Fore
+from colorama import Style
+from docxtpl import DocxTemplate
+from jinja2 import Environment
+from incremental import fingerprint, file_state
+
+_template = None  # template file content of rendering process, see _init_renderer()
+CACHE_SIZE = 64  # prepared xml parts kept, a template has a few parts (body, headers, footers)
+
+
+def _cached(cache, source, make):
+    """ Return value made of source from LRU cache keyed by source hash, least recently used dropped over CACHE_SIZE """
+    key = hashlib.sha1(source.encode('utf-8')).digest()
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+    value = cache[key] = make()
+    if len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+    return value
+
+
+class _Environment(Environment):
+    """ Jinja environment compiling every template source once, see _cached() """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compiled = OrderedDict()
+
+    def from_string(self, source, *args, **kwargs):
+        return _cached(self.compiled, source, lambda: super(_Environment, self).from_string(source, *args, **kwargs))
+
+
+class _Template(DocxTemplate):
+    """ Docx template reusing prepared (patched) xml parts between renders, see _cached() """
+    patched = OrderedDict()  # shared by templates of the process: every render opens the template anew
+
+    def patch_xml(self, src_xml):
+        return _cached(self.patched, src_xml, lambda: super(_Template, self).patch_xml(src_xml))
+
+
+_jinja = _Environment()  # shared by all the renders of the process
+
+
+def cache_stats():
+    """ Return rendering caches sizes of the process """
+    return {'patched xml': len(_Template.patched), 'compiled templates': len(_jinja.compiled), 'limit': CACHE_SIZE}
+
+
+def _content_key(template_state, context):
+    """ Return document content fingerprint: template and context without report date,
+    so documents of unchanged data are not re-rendered on the next days """
+    return fingerprint(template_state, [{k: v for k, v in project.items() if k != 'rep_date'}
+                                        for project in context['projects']])
+
+
+def _unchanged(rendered, filename, key):
+    """ Check document was rendered from the same context and template and is still in place """
+    return rendered is not None and rendered.get(filename) == key and os.path.isfile(filename)
+
+
+def export_sheet(context, template, filename='DocExample.docx', rendered=None):
+    """
+    Render context to document.
+    @param rendered: dict {filename: content fingerprint} of stored documents, rendering is skipped if the document
+    is unchanged (report date is not compared, unchanged document keeps its date); refreshed in place
+    """
+    key = None if rendered is None else _content_key(file_state(template), context)
+    if _unchanged(rendered, filename, key):
+        print(f'{Fore.GREEN}Unchanged "{filename}".{Style.RESET_ALL}')
+        return
+    print(f'{Fore.GREEN}Rendering...{Style.RESET_ALL}')
+    doc = _Template(template)
+    doc.render(context, _jinja)
+    doc.save(filename)
+    if rendered is not None:
+        rendered[filename] = key
+    print(f'{Fore.GREEN}Complete and stored to "{filename}".{Style.RESET_ALL}')
+
+
+def _init_renderer(template):
+    """ Read template once per rendering process """
+    global _template
+    with open(template, 'rb') as f:
+        _template = f.read()
+
+
+def _render(context, filename):
+    """ Render context with process template and store document, return filename """
+    doc = _Template(io.BytesIO(_template))
+    doc.render(context, _jinja)
+    doc.save(filename)
+    return filename
+
+
+def export_split(context, template, filename='DocExample.docx', size=1, jobs=None, rendered=None):
+    """
+    Render projects groups to separate documents in parallel processes.
+    Documents are named as filename with group number suffix: "name-01.docx", "name-02.docx"...
+    @param context: report context, see export_sheet()
+    @param template: template docx filename
+    @param filename: report filename
+    @param size: projects count per document
+    @param jobs: rendering processes count, default - CPU count
+    @param rendered: dict {filename: content fingerprint} of stored documents, only changed documents are rendered
+    (report date is not compared); refreshed in place
+    @return: list of stored documents filenames
+    """
+    projects = context['projects']
+    base, ext = os.path.splitext(filename)
+    groups = [context | {'projects': projects[i:i + size]} for i in range(0, len(projects), size)]
+    filenames = [f'{base}-{n:02d}{ext}' for n in range(1, len(groups) + 1)]
+    template_state = None if rendered is None else file_state(template)
+    keys = [None if rendered is None else _content_key(template_state, group) for group in groups]
+    todo = [i for i, (name, key) in enumerate(zip(filenames, keys)) if not _unchanged(rendered, name, key)]
+    print(f'{Fore.GREEN}Rendering {len(todo)} documents'
+          f'{f" ({len(groups) - len(todo)} unchanged)" if len(todo) < len(groups) else ""}...{Style.RESET_ALL}')
+    if todo:
+        jobs = jobs or max(1, min(len(todo), os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_renderer, initargs=(template,)) as pool:
+            for name, i in zip(pool.map(_render, [groups[i] for i in todo], [filenames[i] for i in todo]), todo):
+                print(f'{"; ".join(p["project"] for p in groups[i]["projects"])} stored to "{name}".')
+    if rendered is not None:
+        rendered.clear()
+        rendered.update(zip(filenames, keys))
+    print(f'{Fore.GREEN}Complete.{Style.RESET_ALL}')
+    return filenames
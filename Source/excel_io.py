@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import os
+import pickle
+from collections import Counter
+import pandas as pd
+
+try:  # fast Rust reader, used if installed (pip install python-calamine)
+    import python_calamine  # noqa: F401
+    ENGINE = 'calamine'
+except ImportError:
+    ENGINE = 'openpyxl'  # pandas opens workbook in read-only mode
+
+_stats = Counter()  # parsed sheets cache hits and misses
+
+
+def _cache_dir():
+    """ Return per user cache folder: %LOCALAPPDATA%\\costsheet\\xlcache on Windows, ~/.cache/costsheet/xlcache else """
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~\\AppData\\Local')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'costsheet', 'xlcache')
+
+
+CACHE_DIR = _cache_dir()
+
+
+def _cache_ready() -> bool:
+    """ Create cache folder accessible by the user only, check existing one is owned by the user and not shared:
+    cached pickles are trusted, so nobody else may write there """
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        if os.name == 'nt':  # user profile folder is private by its ACL
+            return True
+        stat = os.stat(CACHE_DIR)
+    except OSError:
+        return False
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+        logging.warning(f'workbook cache folder {CACHE_DIR} is not private, cache disabled')
+        return False
+    return True
+
+
+def _cache_name(filename, sheets, state):
+    """ Return cache filename for the workbook and sheets request: request hash and workbook state hash,
+    so cache of changed workbook is never opened """
+    key = repr((os.path.abspath(filename), ENGINE, sorted(sheets.items(), key=str)))
+    return os.path.join(CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + '-' +
+                        hashlib.sha1(repr(state).encode()).hexdigest()[:16] + '.pkl')
+
+
+def _file_state(filename):
+    """ Return workbook file state: modification time and size """
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_sheets(filename, sheets, cache=True):
+    """
+    Read workbook sheets, opening the workbook once.
+    Parsed result is cached on disk (per user folder, see CACHE_DIR) until the workbook file changes
+    (modification time or size).
+    @param filename: xlsx filename
+    @param sheets: dict {sheet name or index: pd.read_excel parsing kwargs (usecols, header, names...)}
+    @param cache: use parsed sheets cache
+    @return: dict {sheet name or index: dataframe}
+    """
+    cache_name = _cache_name(filename, sheets, _file_state(filename)) if cache and _cache_ready() else None
+    if cache_name is not None and os.path.isfile(cache_name):
+        try:
+            with open(cache_name, 'rb') as f:
+                frames = pickle.load(f)
+            _stats['hits'] += 1
+            return frames
+        except Exception as e:  # broken or written by other pandas/numpy version
+            logging.warning(f'unreadable workbook cache for {filename} ({e.__class__.__name__}), reloading')
+    _stats['misses'] += 1
+    with pd.ExcelFile(filename, engine=ENGINE) as book:
+        frames = {sheet: book.parse(sheet, **kwargs) for sheet, kwargs in sheets.items()}
+    if cache_name is not None:
+        try:
+            request = os.path.basename(cache_name).split('-')[0]
+            for name in os.listdir(CACHE_DIR):  # drop caches of the previous workbook states
+                if name.startswith(request + '-'):
+                    os.remove(os.path.join(CACHE_DIR, name))
+            with open(cache_name, 'wb') as f:
+                pickle.dump(frames, f)
+        except OSError:
+            logging.warning(f'unable to cache workbook {filename}')
+    return frames
+
+
+def cache_stats():
+    """ Return parsed sheets cache statistics: hits and misses """
+    return {'hits': _stats['hits'], 'misses': _stats['misses']}
@@ -0,0 +1,225 @@
+import json
+import random
+import re
+import threading
+import time
+import datetime as dt
+from collections import Counter
+from types import SimpleNamespace
+
+
+class FakeTracker:
+    """ Offline stand-in for yandex_tracker_client.TrackerClient.
+    Serves issues, subtask links, users and changelogs from JSON-like data,
+    counts API calls per endpoint and may simulate network latency.
+
+    Data format:
+        {'users': [{'uid': 1, 'login': 'ivanov', 'display': 'Иван Иванов'}, ...],
+         'issues': [{'key': 'Q-1', 'queue': 'Q', 'createdAt': '2025-01-10T10:00:00.000+0000',
+                     'updatedAt': '...', 'subtasks': ['Q-2', ...],
+                     'changelog': [{'updatedAt': '...', 'updatedBy': 1,
+                                    'fields': [{'field': 'spent', 'from': 'PT2H', 'to': 'PT5H'},
+                                               {'field': 'status', 'from': 'open', 'to': 'closed'}]}]}]}
+    """
+
+    PAGE = 50  # changelog entries per page, as Tracker API does
+
+    def __init__(self, data, latency=0.0):
+        """
+        @param data: dict of users and issues, see class description
+        @param latency: seconds of simulated round-trip for every API call
+        """
+        self.latency = latency
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self._users = {str(u['uid']): u for u in data['users']}
+        self._issues = {i['key']: i for i in data['issues']}
+        self.myself = SimpleNamespace(login='robot', display='Robot')
+        self.issues = _Issues(self)
+
+    @classmethod
+    def from_json(cls, filename, latency=0.0):
+        """ Return fake Tracker serving recorded JSON fixture """
+        with open(filename, encoding='utf-8') as f:
+            return cls(json.load(f), latency)
+
+    def to_json(self, filename):
+        """ Store served data as JSON fixture """
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({'users': list(self._users.values()), 'issues': list(self._issues.values())},
+                      f, ensure_ascii=False)
+
+    def call(self, endpoint, pages=1):
+        """ Account API call(s) to endpoint and wait simulated latency """
+        with self._lock:
+            self.calls[endpoint] += pages
+        if self.latency:
+            time.sleep(self.latency * pages)
+
+    @property
+    def users(self):
+        self.call('users')
+        return [SimpleNamespace(uid=int(uid), login=u['login'], display=u['display'])
+                for uid, u in self._users.items()]
+
+    def issue(self, key):
+        return _Issue(self, self._issues[key])
+
+
+class _Issues:
+    """ Fake issues collection: client.issues[key], client.issues.find(query=..., keys=[...]) """
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def __getitem__(self, key):
+        self.tracker.call('issues')
+        return self.tracker.issue(key)
+
+    def find(self, query=None, keys=None, per_page=None, **kwargs):
+        """ Search issues by keys list or by query.
+        Query subset supported: 'Queue: Q', 'Updated: >= "yyyy-mm-dd"', 'Created: <= "yyyy-mm-dd"' """
+        data = self.tracker._issues
+        found = [data[k] for k in keys if k in data] if keys is not None else list(data.values())
+        if query:
+            queue = re.search(r'Queue:\s*"?([\w-]+)"?', query)
+            updated = re.search(r'Updated:\s*>=\s*"([\d-]+)"', query)
+            created = re.search(r'Created:\s*<=\s*"([\d-]+)"', query)
+            found = [i for i in found
+                     if (queue is None or i['queue'] == queue.group(1)) and
+                     (updated is None or i['updatedAt'][:10] >= updated.group(1)) and
+                     (created is None or i['createdAt'][:10] <= created.group(1))]
+        self.tracker.call('issues/_search', max(1, -(-len(found) // (per_page or self.tracker.PAGE))))
+        return [self.tracker.issue(i['key']) for i in found]
+
+
+class _Issue:
+    """ Fake issue object """
+
+    def __init__(self, tracker, data):
+        self._tracker = tracker
+        self._data = data
+        self.key = data['key']
+        self.createdAt = data['createdAt']
+        self.updatedAt = data['updatedAt']
+        self.summary = data.get('summary', self.key)
+
+    @property
+    def links(self):
+        self._tracker.call('links')
+        kind = SimpleNamespace(id='subtask', inward='Подзадача', outward='Родительская задача')
+        return [SimpleNamespace(type=kind, direction='outward', object=_Reference(self._tracker, key))
+                for key in self._data.get('subtasks', [])]
+
+    @property
+    def changelog(self):
+        return _Changelog(self._tracker, self._data.get('changelog', []))
+
+
+class _Reference:
+    """ Fake linked issue reference, dereferenced (API call) on first attribute access """
+
+    def __init__(self, tracker, key):
+        self._tracker = tracker
+        self.key = key
+        self._issue = None
+
+    def __getattr__(self, name):
+        if self._issue is None:
+            self._issue = self._tracker.issues[self.key]
+        return getattr(self._issue, name)
+
+
+class _Changelog:
+    """ Fake issue changelog collection """
+
+    def __init__(self, tracker, entries):
+        self.tracker = tracker
+        self.entries = entries
+
+    def __iter__(self):
+        return iter(self.get_all())
+
+    def get_all(self, sort=None, field=None, **kwargs):
+        entries = sorted(self.entries, key=lambda e: e['updatedAt'], reverse=sort == 'desc')
+        if field is not None:
+            entries = [e for e in entries if any(f['field'] in field for f in e['fields'])]
+        return _Pages(self.tracker, [self._log(e) for e in entries])
+
+    def _log(self, entry):
+        user = self.tracker._users.get(str(entry['updatedBy']), {'display': str(entry['updatedBy'])})
+        return SimpleNamespace(
+            updatedAt=entry['updatedAt'],
+            updatedBy=SimpleNamespace(id=str(entry['updatedBy']), display=user['display']),
+            fields=[{'field': SimpleNamespace(id=f['field']),
+                     'from': f['from'] if f['field'] in ['spent', 'estimation'] or f['from'] is None
+                     else SimpleNamespace(key=f['from']),
+                     'to': f['to'] if f['field'] in ['spent', 'estimation'] or f['to'] is None
+                     else SimpleNamespace(key=f['to'])}
+                    for f in entry['fields']])
+
+
+class _Pages:
+    """ Lazy paginated list: every page read is an API call """
+
+    def __init__(self, tracker, items):
+        self.tracker = tracker
+        self.items = items
+
+    def __iter__(self):
+        for n, item in enumerate(self.items):
+            if n % self.tracker.PAGE == 0:
+                self.tracker.call('changelog')
+            yield item
+        if not self.items:
+            self.tracker.call('changelog')
+
+
+def synthetic(persons=10, issues=1000, projects=5, year=2025, changes=8, subtree=0.2, seed=1):
+    """
+    Return synthetic Tracker data for FakeTracker and matching ScanData tables.
+    @param persons: persons count (Tracker users count is twice bigger)
+    @param issues: issues count
+    @param projects: projects count, every project is a queue
+    @param year: changelog dates are spread over the year
+    @param changes: average changelog entries per issue
+    @param subtree: part of projects requested as '#ROOT' subtasks trees instead of queue query
+    @param seed: random seed
+    @return: tuple of (data dict, projects rows [(name, request)], persons rows [(name, login, move_cost)])
+    """
+    rnd = random.Random(seed)
+    users = [{'uid': 1000 + n, 'login': f'user{n:04d}', 'display': f'User{n:04d} Name{n:04d}'}
+             for n in range(persons * 2)]
+
+    def stamp(day):
+        return (dt.datetime(year, 1, 1, tzinfo=dt.timezone.utc) +
+                dt.timedelta(days=day, seconds=rnd.randrange(86400))).strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+
+    items = list()
+    per_queue = max(1, issues // projects)
+    for n in range(issues):
+        queue = f'Q{min(n // per_queue, projects - 1)}'
+        born = rnd.randrange(330)
+        log = list()
+        spent = 0
+        for day in sorted(rnd.randrange(born, 365) for _ in range(rnd.randint(0, changes * 2))):
+            uid = rnd.choice(users)['uid']
+            if rnd.random() < 0.7:
+                hours = rnd.randint(1, 8)
+                fields = [{'field': 'spent', 'from': f'PT{spent}H' if spent else None, 'to': f'PT{spent + hours}H'}]
+                spent += hours
+            else:
+                fields = [{'field': 'status', 'from': 'open', 'to': rnd.choice(['inProgress', 'closed'])}]
+            log.append({'updatedAt': stamp(day), 'updatedBy': uid, 'fields': fields})
+        items.append({'key': f'{queue}-{n + 1}', 'queue': queue, 'createdAt': stamp(born),
+                      'updatedAt': log[-1]['updatedAt'] if log else stamp(born), 'changelog': log})
+    # link every queue as a tree: issue n is subtask of issue (n - 1) // 3 of the same queue
+    roots = dict()
+    for n, item in enumerate(items):
+        first = roots.setdefault(item['queue'], n)
+        if n > first:
+            items[first + (n - first - 1) // 3].setdefault('subtasks', list()).append(item['key'])
+    project_rows = [(f'Project {p}', f'#{items[roots[f"Q{p}"]]["key"]}' if p < projects * subtree
+                     else f'Queue: Q{p}') for p in range(projects)]
+    person_rows = [(f'Person{n:04d}', users[n]['display'].split()[0], '' if n % 3 else 1) for n in range(persons)]
+    return {'users': users, 'issues': items}, project_rows, person_rows
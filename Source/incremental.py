@@ -0,0 +1,42 @@
+import hashlib
+import json
+import logging
+import os
+
+
+def fingerprint(*values):
+    """ Return stable hash of values (python builtins: numbers, strings, lists, tuples, dicts) """
+    return hashlib.sha1(repr(values).encode('utf-8')).hexdigest()
+
+
+def file_state(filename):
+    """ Return file state: modification time and size """
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_state(filename):
+    """
+    Load stored results of the previous incremental run.
+    State is plain JSON (not pickle): a state file of shared folder can not run code when loaded.
+    @param filename: state filename
+    @return: dict {'persons': {fingerprint: person data}, 'documents': {filename: fingerprint}},
+    empty if there is no (readable) state
+    """
+    state = {'persons': dict(), 'documents': dict()}
+    if os.path.isfile(filename):
+        try:
+            with open(filename, encoding='utf-8') as f:
+                state |= json.load(f)
+        except (OSError, ValueError, TypeError):
+            logging.warning(f'unreadable incremental state {filename}, recomputing all')
+    return state
+
+
+def save_state(filename, state):
+    """ Store incremental run results for the next run, as JSON (NaN presence marks included) """
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, allow_nan=True)
+    except OSError:
+        logging.warning(f'unable to store incremental state {filename}')
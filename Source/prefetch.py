@@ -0,0 +1,60 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from yandex_tracker_client.exceptions import TrackerServerError, TrackerRequestError
+
+
+def _retryable(e) -> bool:
+    """ Check Tracker error worth to retry: connection failure, throttling or server side error """
+    if isinstance(e, TrackerRequestError):
+        return True
+    return isinstance(e, TrackerServerError) and (e.status_code == 429 or 500 <= (e.status_code or 0) < 600)
+
+
+class Fetcher:
+    """ Bounded thread pool for concurrent Tracker requests, with retry and exponential backoff.
+    One fetcher serves one Tracker host, host_limit bounds simultaneous requests to it.
+    This is the only retry layer: Tracker client is connected without its own retries, see costtrack.connect(). """
+
+    def __init__(self, workers=8, host_limit=None, retries=5, backoff=0.5):
+        """
+        @param workers: pool threads count
+        @param host_limit: max concurrent requests to the Tracker host, default - workers count
+        @param retries: attempts count after the first failure
+        @param backoff: initial retry delay, seconds, doubled on every attempt
+        """
+        self.pool = ThreadPoolExecutor(max_workers=max(workers, 1))
+        self.host = threading.BoundedSemaphore(max(workers if host_limit is None else host_limit, 1))
+        self.retries = retries
+        self.backoff = backoff
+
+    def call(self, func, *args):
+        """ Call Tracker access function, retry on throttling and server errors """
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                with self.host:
+                    return func(*args)
+            except (TrackerServerError, TrackerRequestError) as e:
+                if not _retryable(e) or attempt == self.retries:
+                    raise
+                logging.info(f'Tracker request failed ({e.__class__.__name__}), retry in {delay}s')
+                time.sleep(delay)
+                delay *= 2
+
+    def map(self, func, items, progress=None):
+        """ Return list of func(item) results, in items order
+        @param func: Tracker access function
+        @param items: iterable of function arguments
+        @param progress: optional callable, invoked once per completed item
+        """
+        results = list()
+        for result in self.pool.map(lambda item: self.call(func, item), items):
+            results.append(result)
+            if progress is not None:
+                progress()
+        return results
+
+    def close(self):
+        self.pool.shutdown()
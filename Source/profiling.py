@@ -0,0 +1,116 @@
+import argparse
+import cProfile
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+def _endpoint(method, url):
+    """ Return request endpoint name: method and url path with issue keys and ids replaced by placeholders """
+    path = urlparse(url).path
+    path = re.sub('/[A-Z][A-Z0-9_]*-\\d+(?=/|$)', '/{key}', path)
+    path = re.sub('/\\d+(?=/|$)', '/{id}', path)
+    return f'{method.upper()} {path}'
+
+
+def json_filename(value):
+    """ Argparse type of profile filename: only .json files are written, not to overwrite run input files """
+    if not value.lower().endswith('.json'):
+        raise argparse.ArgumentTypeError(f'profile filename must end with .json: "{value}"')
+    return value
+
+
+class Profiler:
+    """ Run instrumentation: wall and CPU time of named stages, Tracker requests per endpoint,
+    JSON summary and optional cProfile statistics dump.
+    Not started profiler does nothing, so stages may be marked unconditionally. """
+
+    def __init__(self):
+        self.enabled = False
+        self.stages = dict()  # {stage name: {'wall': seconds, 'cpu': seconds, 'count': n}}, in first run order
+        self.calls = Counter()  # {endpoint: requests count}
+        self.call_time = Counter()  # {endpoint: requests seconds}
+        self.counters = list()  # API calls counters kept by clients themselves (offline fake tracker)
+        self.lock = threading.Lock()  # requests are counted from prefetch threads
+        self._cprofile = None
+        self._started = None
+
+    def start(self, cprofile=False):
+        """ Enable profiling
+        @param cprofile: collect cProfile function statistics too """
+        self.enabled = True
+        self._started = time.perf_counter(), time.process_time()
+        if cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @contextmanager
+    def stage(self, name):
+        """ Context of named run stage, repeated stages are summed. CPU time is the process one (all threads) """
+        if not self.enabled:
+            yield
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            with self.lock:
+                stage = self.stages.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'count': 0})
+                stage['wall'] += time.perf_counter() - wall
+                stage['cpu'] += time.process_time() - cpu
+                stage['count'] += 1
+
+    def watch(self, client):
+        """ Count Tracker client HTTP requests (retries included) per endpoint, return the client """
+        if not self.enabled:
+            return client
+        if isinstance(getattr(client, 'calls', None), Counter):  # client counting its calls itself
+            self.counters.append(client.calls)
+            return client
+        session = client._connection.session
+        request = session.request
+
+        def counted(method, url, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return request(method, url, *args, **kwargs)
+            finally:
+                endpoint = _endpoint(method, url)
+                with self.lock:
+                    self.calls[endpoint] += 1
+                    self.call_time[endpoint] += time.perf_counter() - started
+
+        session.request = counted
+        return client
+
+    def summary(self, **extra):
+        """ Return profile summary dict, extra items (like caches statistics) are added as is """
+        calls = self.calls.copy()
+        for counter in self.counters:
+            calls.update(counter)
+        return {'wall': round(time.perf_counter() - self._started[0], 3),
+                'cpu': round(time.process_time() - self._started[1], 3),
+                'stages': {name: {'wall': round(s['wall'], 3), 'cpu': round(s['cpu'], 3), 'count': s['count']}
+                           for name, s in self.stages.items()},
+                'tracker': {'calls': sum(calls.values()),
+                            'endpoints': {endpoint: {'calls': n, 'seconds': round(self.call_time[endpoint], 3)}
+                                          for endpoint, n in calls.most_common()}}} | extra
+
+    def save(self, filename, **extra):
+        """ Store JSON summary to filename, cProfile statistics (if collected) - to the same name with .prof
+        @return: summary dict """
+        summary = self.summary(**extra)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(os.path.splitext(filename)[0] + '.prof')
+        return summary
+
+
+profiler = Profiler()  # run-wide profiler, started by --profile
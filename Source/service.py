@@ -0,0 +1,193 @@
+import argparse
+import json
+import logging
+import time
+import datetime as dt
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from colorama import init as colorama_init
+from colorama import Fore
+from colorama import Style
+import costtrack
+import costsheet
+from data_access import use_store, set_cache_size, cache_stats, UserDirectory
+from cache_store import CacheStore
+from prefetch import Fetcher
+
+
+def define_parser():
+    """ Return CLI arguments parser
+    """
+    parser = argparse.ArgumentParser(description='Costsheet|Costs service - local HTTP API of costtrack and costsheet.',
+                                     epilog='Tracker connection settings in "connect.ini".')
+    parser.add_argument('filename', nargs='?', default='ScanData.xlsx',
+                        help='input excel projects and persons config; default - "ScanData.xlsx"')
+    parser.add_argument('-p', '--port', metavar='PORT', type=int, default=8765,
+                        help='local port to listen; default - 8765')
+    parser.add_argument('--cache', metavar='CACHE_FILE', default='costtrack.cache',
+                        help='persistent Tracker data cache filename; default - "costtrack.cache"')
+    parser.add_argument('--cache-entries', metavar='N', type=int, default=20000,
+                        help='in-memory Tracker data cache limit, issues; default - 20000')
+    parser.add_argument('-w', '--workers', metavar='N', type=int, default=8,
+                        help='concurrent Tracker requests count; default - 8')
+    parser.add_argument('--host-limit', metavar='N', type=int,
+                        help='throttle: max concurrent Tracker requests, below workers count; default - workers count')
+    parser.add_argument('--debug', default=False, action='store_true',
+                        help='logging in debug mode')
+    return parser
+
+
+def _month(value):
+    """ Parse "y-m" report period request parameter """
+    return dt.datetime.strptime(value, '%y-%m')
+
+
+class Service:
+    """ Warm costtrack and costsheet pipelines: Tracker client, users directory,
+    in-memory and persistent Tracker data caches are kept between requests. """
+
+    def __init__(self, filename='ScanData.xlsx', client=None, cache='costtrack.cache', cache_entries=20000,
+                 workers=8, host_limit=None):
+        """
+        @param filename: input excel projects and persons config
+        @param client: Tracker client, connected with "connect.ini" settings if not defined
+        @param cache: persistent Tracker data cache filename
+        @param cache_entries: in-memory Tracker data cache limit
+        @param workers: concurrent Tracker requests count
+        @param host_limit: concurrent Tracker requests count, default - workers count
+        """
+        self.filename = filename
+        self.client = costtrack.connect() if client is None else client
+        self.store = CacheStore(cache)
+        use_store(self.store)
+        set_cache_size(cache_entries)
+        self.fetcher = Fetcher(workers=workers, host_limit=host_limit)
+        self._directory = None
+        self._directory_day = None
+
+    def directory(self):
+        """ Return users directory, reloaded once a day """
+        today = dt.date.today()
+        if self._directory_day != today:
+            self._directory = self.fetcher.call(UserDirectory.load, self.client)
+            self._directory_day = today
+        return self._directory
+
+    def costs(self, first=None, last=None, combined=False, output='xlsx'):
+        """
+        Gather costs reports, see costtrack.py.
+        @param first: first report month date, default - previous month until 14th, current month since 15th
+        @param last: last report month date, default - same as first
+        @param combined: store all the months to one workbook
+        @param output: 'xlsx', 'npz' or 'both', see costtrack.store_reports()
+        @return: list of stored filenames
+        """
+        first = costtrack.default_month() if first is None else first
+        periods = costtrack.report_months(first, first if last is None else last)
+        if not periods:
+            raise ValueError('Empty report periods range!')
+        if output not in ['xlsx', 'npz', 'both']:
+            raise ValueError(f'unknown output {output}')
+        entries = None if output == 'xlsx' else list()
+        boss, reports = costtrack.collect(self.client, self.filename, periods, self.fetcher,
+                                          self.directory(), verbose=False, entries=entries)
+        return costtrack.store_reports(boss, periods, reports, combined, output, entries)
+
+    def t13(self, period=None, table=None, template='t-13-template v5.docx', split=None, jobs=None,
+            incremental=False):
+        """
+        Render T13 costs report, see costsheet.py.
+        @return: list of stored documents filenames
+        """
+        period = costtrack.default_month() if period is None else period
+        return costsheet.report(period, table, template, split, jobs, incremental=incremental)
+
+    def stats(self):
+        from docx_render import cache_stats as render_cache_stats
+        return {'memory': cache_stats(), 'persistent': self.store.stats(), 'render': render_cache_stats()}
+
+    def close(self):
+        self.fetcher.close()
+        self.store.close()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """ Service requests handler:
+        GET /costs?date=25-6 | /costs?from=25-1&to=25-6[&combined=1][&output=xlsx|npz|both]
+        GET /t13?date=25-6[&table=T13.xlsx][&template=t.docx][&split=N][&jobs=N][&incremental=1]
+        GET /stats
+    Answers JSON: {"files": [...], "seconds": ...} or {"error": "..."}. """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        service = self.server.service
+        started = time.perf_counter()
+        try:
+            if url.path == '/costs':
+                first = query.get('from', query.get('date'))
+                answer = {'files': service.costs(_month(first) if first else None,
+                                                 _month(query['to']) if 'to' in query else None,
+                                                 query.get('combined', '0') not in ['0', ''],
+                                                 query.get('output', 'xlsx'))}
+            elif url.path == '/t13':
+                answer = {'files': service.t13(_month(query['date']) if 'date' in query else None,
+                                               query.get('table'),
+                                               query.get('template', 't-13-template v5.docx'),
+                                               int(query['split']) if 'split' in query else None,
+                                               int(query['jobs']) if 'jobs' in query else None,
+                                               query.get('incremental', '0') not in ['0', ''])}
+            elif url.path == '/stats':
+                answer = service.stats()
+            else:
+                self._answer(404, {'error': f'unknown request {url.path}'})
+                return
+        except (ValueError, KeyError) as e:
+            logging.warning(f'request {self.path} error: {e}')
+            self._answer(400, {'error': str(e)})
+            return
+        except Exception as e:
+            logging.exception('Common error')
+            self._answer(500, {'error': str(e)})
+            return
+        answer['seconds'] = round(time.perf_counter() - started, 3)
+        self._answer(200, answer)
+
+    def _answer(self, code, answer):
+        body = json.dumps(answer, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.info(f'{self.address_string()} {format % args}')
+
+
+def main():
+    args = define_parser().parse_args()
+    colorama_init()
+    logging.basicConfig(filename='costsheet.log',
+                        filemode='a',
+                        format='%(asctime)s %(name)s %(levelname)s %(message)s',
+                        datefmt='%d/%m/%y %H:%M:%S',
+                        level=logging.INFO if args.debug else logging.WARNING)
+    logging.info('Costs service started.')
+    service = Service(args.filename, cache=args.cache, cache_entries=args.cache_entries, workers=args.workers,
+                      host_limit=args.host_limit)
+    server = HTTPServer(('127.0.0.1', args.port), Handler)  # local only, requests served one by one
+    server.service = service
+    print(f'{Fore.GREEN}Costs service at {Fore.CYAN}http://127.0.0.1:{args.port}/{Style.RESET_ALL} '
+          f'(/costs?date=yy-mm, /t13?date=yy-mm, /stats), Ctrl+C to stop.')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import datetime as dt
+import pandas as pd
+import pytest
+import costtrack
+import data_access
+from data_access import iso_hrs
+from fake_tracker import FakeTracker, synthetic
+
+STAMP = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+
+def _spend_loop(issues, registry, persons, periods):
+    """ Reference: per person, project and issue changelog scan aggregate() replaced """
+    reports = list()
+    for start, final in periods:
+        report = pd.DataFrame(0, index=persons['name'].tolist(), columns=list(registry), dtype='int64')
+        for project, keys in registry.items():
+            for _, person in persons.iterrows():
+                lc = costtrack.move_cost(person)
+                s = 0
+                for issue in (issues[key] for key in keys):
+                    if not costtrack.in_period(issue, start, final):
+                        continue
+                    for log in issue.changelog:
+                        date = dt.datetime.strptime(log.updatedAt, STAMP).date()
+                        if not (start.date() <= date <= final.date() and
+                                costtrack.login_match(person['login'], log.updatedBy.display)):
+                            continue
+                        for field in log.fields:
+                            if field['field'].id == 'spent':
+                                s += iso_hrs(field['to']) - iso_hrs(field['from'])
+                            elif field['field'].id == 'status':
+                                s += lc
+                report.at[person['name'], project] = s
+        reports.append(report)
+    return reports
+
+
+@pytest.fixture
+def tracker_data():
+    data_access.use_store(None)
+    data_access.set_cache_size(100000)
+    data, project_rows, person_rows = synthetic(persons=8, issues=400, projects=4, subtree=0.5)
+    tracker = FakeTracker(data)
+    projects = pd.DataFrame(project_rows, columns=['name', 'request'])
+    persons = pd.DataFrame(person_rows, columns=['name', 'login', 'move_cost'])
+    issues, registry = costtrack.resolve_projects(tracker, projects)
+    yield tracker, issues, registry, persons
+    data_access.set_cache_size(20000)
+
+
+@pytest.mark.parametrize('months', [(1, 1), (3, 5), (1, 12)])
+def test_aggregate_matches_spend_loop(tracker_data, months):
+    tracker, issues, registry, persons = tracker_data
+    periods = costtrack.report_months(dt.datetime(2025, months[0], 1), dt.datetime(2025, months[1], 1))
+    expected = _spend_loop(issues, registry, persons, periods)
+    assert sum(int(reference.to_numpy().sum()) for reference in expected) > 0
+    for directory in [None, data_access.UserDirectory.load(tracker)]:
+        reports = costtrack.aggregate(issues, registry, persons, periods, directory)
+        assert len(reports) == len(periods)
+        for report, reference in zip(reports, expected):
+            pd.testing.assert_frame_equal(report, reference)
+
+
+def test_aggregate_entries_sum_to_report(tracker_data):
+    _, issues, registry, persons = tracker_data
+    periods = costtrack.report_months(dt.datetime(2025, 2, 1), dt.datetime(2025, 4, 1))
+    entries = list()
+    reports = costtrack.aggregate(issues, registry, persons, periods, entries=entries)
+    for report, details in zip(reports, entries):
+        summed = details.groupby(['name', 'project'])['value'].sum().unstack(fill_value=0) \
+            .reindex(index=report.index, columns=report.columns, fill_value=0)
+        assert (summed.to_numpy() == report.to_numpy()).all()
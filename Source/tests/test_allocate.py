@@ -0,0 +1,60 @@
+import random
+import pytest
+from costsheet import allocate
+
+
+def _allocate_loop(hours, status, costs, days_count):
+    """ Reference: day by day allocation loop allocate() replaced """
+    projects = dict()
+    date, job, presence = 1, hours[0], status[0]
+    for project, cost in costs:
+        days = projects[project] = dict()
+        while not cost < 1:
+            spent = int(min(cost, job))
+            if spent:
+                days.update({f'h{date}': spent, f'pres{date}': presence})
+                cost -= spent
+                job -= spent
+            if job < 1 and not cost < 1:
+                date += 1
+                job, presence = hours[date - 1], status[date - 1]
+        part1 = [days[f'h{d}'] for d in range(1, 16) if f'h{d}' in days]
+        part2 = [days[f'h{d}'] for d in range(16, 32) if f'h{d}' in days]
+        days.update({'hp1': sum(part1), 'dp1': len(part1), 'hp2': sum(part2), 'dp2': len(part2),
+                     'sh': sum(part1) + sum(part2), 'sd': len(part1) + len(part2)})
+    for days in projects.values():
+        for date in range(1, 32):
+            if f'h{date}' not in days:
+                if date > days_count or date > len(hours):
+                    days.update({f'h{date}': 'X', f'pres{date}': 'X'})
+                else:
+                    days.update({f'h{date}': ' ',
+                                 f'pres{date}': 'Н' if hours[date - 1] > 0 else status[date - 1]})
+    return projects
+
+
+def _case(rnd, days_count, table_days):
+    hours = [rnd.choice([0, 0, 4, 8, 8, 8, 12]) for _ in range(table_days)]
+    status = [rnd.choice(['Я', 'В', 'ОТ', 'Б']) for _ in range(table_days)]
+    budget = sum(hours)
+    costs = list()
+    for n in range(rnd.randint(0, 6)):
+        cost = rnd.choice([rnd.randint(1, 40), rnd.uniform(0.5, 40)])  # whole and fractional hours
+        if sum(int(c) for _, c in costs) + int(cost) > budget:
+            break
+        costs.append((f'Project {n}', cost))
+    return hours, status, costs
+
+
+@pytest.mark.parametrize('days_count', [28, 29, 30, 31])
+def test_allocate_matches_day_loop(days_count):
+    rnd = random.Random(days_count)
+    for _ in range(500):
+        table_days = rnd.choice([days_count, 31])
+        hours, status, costs = _case(rnd, days_count, table_days)
+        assert allocate(hours, status, costs, days_count) == _allocate_loop(hours, status, costs, days_count)
+
+
+def test_allocate_not_enough_time():
+    with pytest.raises(ValueError):
+        allocate([8, 0, 8], ['Я', 'В', 'Я'], [('Project', 17)], 3)
@@ -0,0 +1,70 @@
+import datetime as dt
+import os
+import pandas as pd
+import pytest
+import columnar
+import costsheet
+import costtrack
+
+BOSS = pd.DataFrame([['Должность', 'Начальник'], ['Инициалы, фамилия', 'И.И. Иванов']])
+PERIOD = dt.datetime(2025, 6, 1)
+
+
+def _store(report, entries, output='both'):
+    periods = costtrack.report_months(PERIOD, PERIOD)
+    return costtrack.store_reports(BOSS, periods, [report], output=output, entries=[entries])
+
+
+@pytest.fixture
+def report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return pd.DataFrame([[3, 0, 7], [0, 12, 1]], index=['Person A', 'Person B'],
+                        columns=['Project 1', 'Project 2', 'Project 3']).astype('int64')
+
+
+@pytest.fixture
+def entries():
+    return pd.DataFrame({'name': ['Person A', 'Person B', 'Person B'],
+                         'project': ['Project 1', 'Project 2', 'Project 2'],
+                         'key': ['Q-1', 'Q-2', 'Q-3'], 'kind': ['spent', 'spent', 'status'], 'value': [3, 11, 1]})
+
+
+def _load_workbook():
+    os.remove('costs-25-06.npz')
+    return costsheet.load_costs(PERIOD)
+
+
+def test_npz_loads_as_workbook(report, entries):
+    assert _store(report, entries) == ['costs-25-06.xlsx', 'costs-25-06.npz']
+    costs, boss = costsheet.load_costs(PERIOD)
+    pd.testing.assert_frame_equal(costs, report)
+    workbook_costs, workbook_boss = _load_workbook()
+    pd.testing.assert_frame_equal(costs, workbook_costs)
+    pd.testing.assert_frame_equal(boss, workbook_boss)
+
+
+def test_edited_workbook_preferred(report, entries):
+    _store(report, entries)
+    edited = report.copy()
+    edited.iat[0, 0] = 5
+    stamp = os.path.getmtime('costs-25-06.npz')
+    with pd.ExcelWriter('costs-25-06.xlsx') as writer:
+        BOSS.to_excel(writer, sheet_name='boss', header=False, index=False)
+        edited.to_excel(writer, sheet_name='costs')
+    os.utime('costs-25-06.xlsx', (stamp + 10, stamp + 10))
+    pd.testing.assert_frame_equal(costsheet.load_costs(PERIOD)[0], edited)
+
+
+def test_entries_and_repeated_labels(report, entries):
+    report.index = ['Person A', 'Person A']
+    entries['name'] = 'Person A'
+    _store(report, entries, 'npz')
+    costs, _, details = columnar.load_costs('costs-25-06.npz', entries=True)
+    pd.testing.assert_frame_equal(costs, report)
+    pd.testing.assert_frame_equal(details, entries)
+
+
+def test_unknown_entry_rejected(report, entries):
+    entries.loc[0, 'name'] = 'Person Z'
+    with pytest.raises(ValueError, match='Person Z'):
+        _store(report, entries, 'npz')
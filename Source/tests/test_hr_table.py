@@ -0,0 +1,88 @@
+import math
+import re
+import numpy as np
+import pandas as pd
+import pytest
+import excel_io
+from costsheet import import_hr_table
+
+DAYS = 5
+
+
+def _import_rows(in_table):
+    """ Reference: per row parser import_hr_table() replaced; reports the first bad row only """
+    in_table = pd.concat([in_table, pd.DataFrame(np.nan, index=[len(in_table), len(in_table) + 1],
+                                                 columns=in_table.columns)])  # old parser needed the tail rows
+    persons = list()
+    for index, row in in_table.iterrows():
+        if re.match('[А-ЯЁа-яё \\-]+', str(row[2])) and re.match('\\d+', str(row[1])):
+            words = str(row[2]).split() + str(in_table.iloc[index + 1, 1]).split() + \
+                str(in_table.iloc[index + 2, 1]).split()
+            name = ' '.join(words[:2])
+            if not re.match('^[А-ЯЁ][а-яё]+(?:-[А-ЯЁ][а-яё]+)*(?:\\s[А-ЯЁ][а-яё]+(?:-[А-ЯЁ][а-яё]+)*){1,2}$',
+                            name):
+                raise ValueError(f'Name not properly formatted: "{name}"')
+            emp_num = str(row[1]).strip()
+            if not re.match('^\\d+$', emp_num):
+                raise ValueError(f'Employee "{name}" number not properly formatted: "{emp_num}"')
+            status = in_table.iloc[index + 1, 9:].tolist()
+            times = [0 if math.isnan(t) else math.floor(t) for t in row[9:].to_list()]
+            person = {'name': name, 'num': emp_num, 'spec': '', 'total': sum(times)}
+            person.update({f'h{i}': t for i, t in enumerate(times, 1)})
+            person.update({f'pres{i}': t for i, t in enumerate(status, 1)})
+            persons.append(person)
+    return pd.DataFrame(persons).set_index('name')
+
+
+def _block(num, surname, name, hours, status, third=True):
+    rows = [[np.nan, num, surname] + [np.nan] * 6 + hours,
+            [np.nan, name, np.nan] + [np.nan] * 6 + status]
+    if third:
+        rows.append([np.nan, 'Инженер', np.nan] + [np.nan] * (6 + DAYS))
+    return rows
+
+
+def _table(*blocks):
+    rows = [[np.nan, '№', 'Фамилия'] + [np.nan] * 6 + list(range(1, DAYS + 1)),  # header rows are skipped
+            [np.nan, np.nan, 'Табель'] + [np.nan] * (6 + DAYS)]
+    for block in blocks:
+        rows += block
+    return pd.DataFrame(rows, dtype=object)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_io, 'CACHE_DIR', str(tmp_path / 'cache'))
+
+    def write(table):
+        filename = str(tmp_path / 'T13.xlsx')
+        table.to_excel(filename, header=False, index=False)
+        return filename
+    return write
+
+
+def test_matches_row_parser(store):
+    table = _table(_block('101', 'Иванов', 'Иван', [8, 7.5, np.nan, 0.4, 12], ['Я', 'Я', 'В', 'Я', 'С']),
+                   _block(102, 'Петрова-Водкина', 'Анна Сергеевна', [4, 4, 4, 4, 4], ['Я'] * 5),
+                   _block('103', 'Сидоров', 'Пётр', [np.nan, 8, 8, 8, 8.99], ['Б', 'Я', 'Я', 'Я', 'Я'],
+                          third=False))  # last block without the third row
+    filename = store(table)
+    parsed = import_hr_table(filename)
+    expected = _import_rows(pd.read_excel(filename, header=None, index_col=None))
+    assert parsed.index.tolist() == ['Иванов Иван', 'Петрова-Водкина Анна', 'Сидоров Пётр']
+    pd.testing.assert_frame_equal(parsed, expected, check_dtype=False)
+    assert parsed.loc['Иванов Иван', 'total'] == 27
+
+
+def test_all_bad_rows_reported(store):
+    table = _table(_block('101', 'иванов', 'Иван', [8] * DAYS, ['Я'] * DAYS),
+                   _block('102', 'Петров', 'Пётр', [8] * DAYS, ['Я'] * DAYS),
+                   _block('10З', 'Сидоров', 'Сидор', [8] * DAYS, ['Я'] * DAYS))
+    filename = store(table)
+    with pytest.raises(ValueError, match='Name not properly formatted'):
+        _import_rows(pd.read_excel(filename, header=None, index_col=None))  # old parser stops at the first
+    with pytest.raises(ValueError) as error:
+        import_hr_table(filename)
+    message = str(error.value)
+    assert 'row 3: name not properly formatted: "иванов Иван"' in message
+    assert 'row 9: employee "Сидоров Сидор" number not properly formatted: "10З"' in message
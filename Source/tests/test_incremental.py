@@ -0,0 +1,27 @@
+import pickle
+from incremental import fingerprint, load_state, save_state
+
+
+def _state():
+    projects = {'Project 1': {'h1': 8, 'h2': ' ', 'h3': 'X', 'pres1': 'Я', 'pres2': float('nan'), 'hp1': 8, 'sd': 1}}
+    person = {'name': 'Иванов Иван Иванович', 'num': '102', 'spec': 'инженер', 'projects': projects}
+    return {'persons': {fingerprint(person): person}, 'documents': {'login-t13-25-06-01.docx': fingerprint(1)}}
+
+
+def test_state_round_trip(tmp_path):
+    filename = str(tmp_path / 'login-t13-25-06.state')
+    state = _state()
+    save_state(filename, state)
+    loaded = load_state(filename)
+    # NaN is not equal to itself: compare as documents content keys are computed
+    assert fingerprint(loaded) == fingerprint(state)
+
+
+def test_foreign_state_is_not_loaded(tmp_path):
+    filename = str(tmp_path / 'login-t13-25-06.state')
+    with open(filename, 'wb') as f:
+        pickle.dump(_state(), f)
+    assert load_state(filename) == {'persons': dict(), 'documents': dict()}
+    with open(filename, 'w') as f:
+        f.write('[1, 2]')
+    assert load_state(filename) == {'persons': dict(), 'documents': dict()}
@@ -0,0 +1,54 @@
+import random
+import time
+from costsheet import NameIndex
+
+NAMES = ['Овчинников Иван', 'Петров Иван', 'Иванова-Петрова Анна', 'Сидоров Пётр', 'Поторочин Первый',
+         'Поторочин Второй', 'Кузнецова Ольга', 'Ли Ван', 'Ованесов Ашот']
+
+
+def _select_scan(names, selector):
+    """ Reference: plain substring scan NameIndex replaced """
+    return [n for n in names if selector.lower() in n.lower()]
+
+
+def test_select_mid_word():
+    assert NameIndex(NAMES).select('ов') == _select_scan(NAMES, 'ов')
+    assert len(NameIndex(NAMES).select('ов')) > 1
+
+
+def test_select_matches_scan():
+    rnd = random.Random(1)
+    index = NameIndex(NAMES)
+    selectors = ['', ' ', '-', 'а-п', 'ов и', 'в пё', 'Ли', 'ИВАН', 'нет такого']
+    for _ in range(2000):
+        name = rnd.choice(NAMES)
+        first = rnd.randrange(len(name))
+        selectors.append(name[first:rnd.randint(first + 1, len(name))])
+        selectors.append(''.join(rnd.choice('овиа -п') for _ in range(rnd.randint(1, 4))))
+    for selector in selectors:
+        assert index.select(selector) == _select_scan(NAMES, selector), selector
+
+
+def _employees(count, rnd):
+    letters = 'абвгдеёжзийклмнопрстуфхцчшщыэюя'
+
+    def word():
+        return ''.join(rnd.choice(letters) for _ in range(rnd.randint(4, 10))).capitalize()
+    return [f'{word()}{rnd.choice(["ов", "ова", ""])} {word()} {word()}' for _ in range(count)]
+
+
+def test_select_faster_than_scan():
+    rnd = random.Random(2)
+    names = _employees(5000, rnd)
+    selectors = [name.split()[0] for name in rnd.sample(names, 60)] + ['ов', 'ова и']
+    index_time = scan_time = float('inf')
+    for _ in range(3):  # best of runs
+        started = time.perf_counter()
+        index = NameIndex(names)
+        selected = [index.select(selector) for selector in selectors]
+        index_time = min(index_time, time.perf_counter() - started)
+        started = time.perf_counter()
+        scanned = [_select_scan(names, selector) for selector in selectors]
+        scan_time = min(scan_time, time.perf_counter() - started)
+    assert selected == scanned
+    assert index_time < scan_time
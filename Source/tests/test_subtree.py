@@ -0,0 +1,46 @@
+import pytest
+import costtrack
+import data_access
+from cache_store import CacheStore
+from fake_tracker import FakeTracker
+from prefetch import Fetcher
+
+STAMP = '2025-06-10T10:00:00.000+0000'
+
+
+def _issue(key, *subtasks):
+    return {'key': key, 'queue': key.split('-')[0], 'createdAt': STAMP, 'updatedAt': STAMP,
+            'subtasks': list(subtasks), 'changelog': []}
+
+
+@pytest.fixture
+def tracker():
+    # R-1 -> A-1 -> A-2 -> A-1 (cycle), R-1 and R-2 share S-1 -> S-2, R-3 is absent
+    data = {'users': [],
+            'issues': [_issue('R-1', 'A-1', 'S-1'), _issue('A-1', 'A-2'), _issue('A-2', 'A-1'),
+                       _issue('R-2', 'S-1'), _issue('S-1', 'S-2'), _issue('S-2')]}
+    data_access.use_store(None)
+    for cache in data_access._caches:
+        cache.clear()
+    yield FakeTracker(data)
+    data_access.use_store(None)
+
+
+@pytest.mark.parametrize('fetcher', [None, Fetcher(workers=4)])
+def test_subtree_walks_every_issue_once(tracker, fetcher):
+    found = costtrack.subtree(tracker, ['R-1', 'R-2', 'R-3'], fetcher)
+    assert set(found) == {'R-1', 'A-1', 'A-2', 'S-1', 'S-2', 'R-2'}
+    assert all(issue.key == key for key, issue in found.items())
+    assert tracker.calls['links'] == 6  # every found issue links read once: no cycle loop, shared walked once
+
+
+def test_stored_subtree_is_not_walked(tracker, tmp_path):
+    store = CacheStore(str(tmp_path / 'costtrack.cache'))
+    data_access.use_store(store)
+    first = costtrack.subtree(tracker, ['R-1', 'R-2', 'R-3'])
+    for cache in data_access._caches:
+        cache.clear()
+    tracker.calls.clear()
+    assert costtrack.subtree(tracker, ['R-1', 'R-2', 'R-3']).keys() == first.keys()
+    assert tracker.calls['links'] == 0
+    store.close()